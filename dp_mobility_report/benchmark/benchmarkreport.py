@@ -1,19 +1,25 @@
+import copy
 import os
 import warnings
 from pathlib import Path
 from shutil import rmtree
-from typing import List, Optional, Union
+from typing import Iterable, List, Optional, Union
 
 import numpy as np
+import pandas as pd
 from geopandas import GeoDataFrame
 from pandas import DataFrame
+from tqdm.auto import tqdm
 
+from dp_mobility_report import constants as const
 from dp_mobility_report.benchmark import b_utils, preprocessing
 from dp_mobility_report.benchmark.similarity_measures import (
     compute_similarity_measures,
     get_selected_measures,
+    select_measures,
 )
 from dp_mobility_report.dpmreport import DpMobilityReport
+from dp_mobility_report.model import ingestion
 from dp_mobility_report.report.html.templates import (
     create_html_assets,
     create_maps_folder,
@@ -29,7 +35,7 @@ class BenchmarkReport:
         The evaluation, i.e., benchmark report, will be generated as an HTML file, using the ``.to_file()`` method.
 
     Args:
-        df_base: ``DataFrame`` containing the baseline mobility data, see argument ``df`` of ``DpMobilityReport``.
+        df_base: ``DataFrame`` containing the baseline mobility data, see argument ``df`` of ``DpMobilityReport`` (which also accepts a file path or an iterable of ``DataFrame`` chunks).
         tessellation: Geopandas ``GeoDataFrame`` containing the tessellation for spatial aggregations. Expected columns: ``tile_id``. If tessellation is not provided in the expected default CRS EPSG:4326 it will automatically be transformed. If no tessellation is provided, all analyses based on the tessellation will automatically be removed.
         df_alternative: ``DataFrame`` containing the alternative mobility data to be compared against the baseline dataset, see argument ``df`` of ``DpMobilityReport``. If ``None``, ``df_base`` is used for both reports.
         privacy_budget_base: privacy_budget for the differentially private base report. Defaults to ``None``, i.e., no privacy guarantee is provided.
@@ -62,7 +68,9 @@ class BenchmarkReport:
         gaussian: Whether the Gaussian Mechanism should be applied instead of LaPlace. Defaults to ``False``.
         delta: The probability of failing to achieve epsilon-dp. Only needed if Gaussian Mechanism is chosen. Has to be of type float and in range (0,1].  Defaults to ``None``. i.e. standard Noise Mechanisms are used
         delta_alternative: The probability of failing to achieve epsilon-dp. Only needed if Gaussian Mechanism is chosen. Has to be of type float and in range (0,1].  Defaults to ``None``. i.e. standard Noise Mechanisms are used
-        evalu_analysis_selection_count: Fake count of selcted analyses for evaluation purposes. Defaults to ``None``."""
+        evalu_analysis_selection_count: Fake count of selcted analyses for evaluation purposes. Defaults to ``None``.
+        cache_dir: Directory to cache the preprocessed data of both reports in, see argument ``cache_dir`` of ``DpMobilityReport``. Defaults to ``None``, i.e., no caching.
+        chunk_size: Number of records per chunk, if ``df_base`` or ``df_alternative`` is given as a file path, see argument ``chunk_size`` of ``DpMobilityReport``. Defaults to ``1_000_000``."""
 
     _report_base: DpMobilityReport
     _report_alternative: DpMobilityReport
@@ -78,9 +86,9 @@ class BenchmarkReport:
 
     def __init__(
         self,
-        df_base: DataFrame,
+        df_base: Union[DataFrame, str, Path, Iterable[DataFrame]],
         tessellation: Optional[GeoDataFrame] = None,
-        df_alternative: Optional[DataFrame] = None,
+        df_alternative: Optional[Union[DataFrame, str, Path, Iterable[DataFrame]]] = None,
         privacy_budget_base: Optional[Union[int, float]] = None,
         privacy_budget_alternative: Optional[Union[int, float]] = None,
         user_privacy_base: bool = True,
@@ -114,10 +122,18 @@ class BenchmarkReport:
         delta_alternative: Union[float, None] = None,
         evalu_analysis_selection_count: Optional[int] = None,
         evalu_analysis_selection_count_alternative: Optional[int] = None,
+        cache_dir: Optional[Union[str, Path]] = None,
+        chunk_size: int = 1_000_000,
     ) -> None:
 
         self.disable_progress_bar = disable_progress_bar
 
+        # an iterable of chunks can only be read once
+        if (df_alternative is None) and not isinstance(
+            df_base, (DataFrame, str, Path)
+        ):
+            df_base = ingestion.read_trip_ends(df_base, chunk_size)
+
         self._report_base = DpMobilityReport(
             df=df_base,
             tessellation=tessellation,
@@ -144,7 +160,9 @@ class BenchmarkReport:
             evalu=evalu,
             gaussian=gaussian,
             delta=delta,
-            evalu_analysis_selection_count=evalu_analysis_selection_count
+            evalu_analysis_selection_count=evalu_analysis_selection_count,
+            cache_dir=cache_dir,
+            chunk_size=chunk_size,
         )
         self.report_base.report
 
@@ -177,7 +195,9 @@ class BenchmarkReport:
             evalu=evalu,
             gaussian=gaussian_alternative,
             delta=delta_alternative,
-            evalu_analysis_selection_count=evalu_analysis_selection_count_alternative
+            evalu_analysis_selection_count=evalu_analysis_selection_count_alternative,
+            cache_dir=cache_dir,
+            chunk_size=chunk_size,
         )
         self.report_alternative.report
 
@@ -186,6 +206,12 @@ class BenchmarkReport:
             self.report_base.analysis_exclusion,
         )
 
+        # sections of the base report before the histogram bins are unified (for further repetitions, see ``repeat()``)
+        self._report_base_sections = {
+            element: copy.copy(section)
+            for element, section in self.report_base.report.items()
+        }
+
         (
             self.report_base._report,
             self.report_alternative._report,
@@ -282,11 +308,77 @@ class BenchmarkReport:
         """Top n coverage of rankings of base and alternative of all selected analyses, where applicable."""
         return self._top_n_cov
 
+    def repeat(self, n: int, seeds: Optional[List[int]] = None) -> DataFrame:
+        """Repeat the alternative report ``n`` times with the same privacy settings but new noise and compute the similarity measures for each repetition.
+        The data of the alternative report is only aggregated once (see ``DpMobilityReport.true_aggregates``), so that each repetition only draws new noise and compares the result to the base report.
+
+        Args:
+            n: Number of repetitions.
+            seeds: Seed for the noise of each repetition, so that the repetitions are reproducible. Needs to be of length ``n``. Defaults to ``None``, i.e., no seeds.
+
+        Returns:
+            ``DataFrame`` with the mean (``mean``) and standard deviation (``std``) of each similarity measure of ``similarity_measures`` over all repetitions. Ranking measures get one row for each 'top n' of ``top_n_ranking`` (e.g., ``visits_per_tile_ranking_top_10``).
+        """
+        if not isinstance(n, int):
+            raise TypeError("'n' is not an integer.")
+        if n <= 0:
+            raise ValueError("'n' has to be greater 0.")
+        if seeds is None:
+            seeds = [None] * n
+        elif len(seeds) != n:
+            raise ValueError(f"'seeds' needs to be of length {n}.")
+
+        report_alternative = self.report_alternative
+        similarity_measures = []
+        for seed in tqdm(
+            seeds, desc="Repeat alternative report", disable=self.disable_progress_bar
+        ):
+            alternative = report_alternative.true_aggregates.release(
+                report_alternative.privacy_budget,
+                report_alternative.delta,
+                report_alternative.gaussian,
+                seed,
+            )
+            base = {
+                element: copy.copy(section)
+                for element, section in self._report_base_sections.items()
+            }
+            base, alternative = preprocessing.unify_histogram_bins(
+                base, alternative, self.analysis_exclusion
+            )
+            smape, kld, jsd, emd, kt, _ = compute_similarity_measures(
+                self.analysis_exclusion,
+                alternative,
+                base,
+                self.report_base.tessellation,
+                self.top_n_ranking,
+                disable_progress_bar=True,
+            )
+            selected_measures = select_measures(
+                self.measure_selection, smape, kld, jsd, emd, kt
+            )
+            # ranking measures are given for each 'top n' of ``top_n_ranking``
+            for measure in [
+                m for m, v in selected_measures.items() if isinstance(v, list)
+            ]:
+                for top_n, value in zip(
+                    self.top_n_ranking, selected_measures.pop(measure)
+                ):
+                    selected_measures[f"{measure}_top_{top_n}"] = value
+            similarity_measures.append(selected_measures)
+
+        similarity_measures = pd.DataFrame(similarity_measures).astype(float)
+        return pd.DataFrame(
+            {"mean": similarity_measures.mean(), "std": similarity_measures.std()}
+        )
+
     def to_file(
         self,
         output_file: Union[str, Path],
         disable_progress_bar: Optional[bool] = None,
         top_n_flows: int = 100,
+        n_jobs: int = 1,
+        map_simplify_tolerance: float = const.MAP_SIMPLIFY_TOLERANCE,
     ) -> None:
         """Write the report to a file.
         By default a name is generated.
@@ -295,6 +387,8 @@ class BenchmarkReport:
             output_file: The name or the path of the file to store the ``html`` output.
             disable_progress_bar: if ``False``, no progress bar is shown.
             top_n_flows: Determines how many of the top ``n`` origin-destination flows are displayed. Defaults to 100.
+            n_jobs: Number of processes to render the segments of the report concurrently. ``-1`` uses all available cores. Defaults to ``1``.
+            map_simplify_tolerance: Tolerance (in degrees) to simplify the tile geometries of the maps with. Borders shared by neighbouring tiles are simplified consistently, so that there are no gaps or overlaps. Defaults to ``0.0001`` (~10 m); ``0`` disables the simplification.
         """
         if disable_progress_bar is None:
             disable_progress_bar = self.disable_progress_bar
@@ -320,7 +414,12 @@ class BenchmarkReport:
         create_html_assets(output_dir)
 
         data, temp_map_folder = render_benchmark_html(
-            self, filename, top_n_flows, disable_progress_bar
+            self,
+            filename,
+            top_n_flows,
+            disable_progress_bar,
+            n_jobs,
+            map_simplify_tolerance,
         )
 
         create_maps_folder(temp_map_folder, output_dir)
@@ -729,28 +729,41 @@ def compute_similarity_measures(
 
 
 def get_selected_measures(benchmarkreport: "BenchmarkReport") -> dict:
+    return select_measures(
+        benchmarkreport.measure_selection,
+        benchmarkreport.smape,
+        benchmarkreport.kld,
+        benchmarkreport.jsd,
+        benchmarkreport.emd,
+        benchmarkreport.kt,
+    )
+
+
+def select_measures(
+    measure_selection: dict, smape: dict, kld: dict, jsd: dict, emd: dict, kt: dict
+) -> dict:
     similarity_measures = {}
 
-    for analysis in benchmarkreport.measure_selection.keys():
-        selected_measure = benchmarkreport.measure_selection[analysis]
+    for analysis in measure_selection.keys():
+        selected_measure = measure_selection[analysis]
         try:
             if selected_measure == const.SMAPE:
                 if analysis == const.DS_STATISTICS:
                     for element in const.DS_STATISTICS_ELEMENTS:
-                        similarity_measures[element] = benchmarkreport.smape[element]
+                        similarity_measures[element] = smape[element]
                 elif analysis == const.MISSING_VALUES:
                     for element in const.MISSING_VALUES_ELEMENTS:
-                        similarity_measures[element] = benchmarkreport.smape[element]
+                        similarity_measures[element] = smape[element]
                 else:
-                    similarity_measures[analysis] = benchmarkreport.smape[analysis]
+                    similarity_measures[analysis] = smape[analysis]
             elif selected_measure == const.KLD:
-                similarity_measures[analysis] = benchmarkreport.kld[analysis]
+                similarity_measures[analysis] = kld[analysis]
             elif selected_measure == const.JSD:
-                similarity_measures[analysis] = benchmarkreport.jsd[analysis]
+                similarity_measures[analysis] = jsd[analysis]
             elif selected_measure == const.EMD:
-                similarity_measures[analysis] = benchmarkreport.emd[analysis]
+                similarity_measures[analysis] = emd[analysis]
             elif selected_measure == const.KT:
-                similarity_measures[analysis] = benchmarkreport.kt[analysis]
+                similarity_measures[analysis] = kt[analysis]
         except KeyError:
             warnings.warn(
                 f"The selected measure {selected_measure} for {analysis} cannot be computed. Value for {analysis} in `self.similarity_measures` will be set to `None`."
@@ -152,3 +152,12 @@ STANDARD_CMAP = "YlOrRd"
 BASE_CMAP = "Blues"
 ALT_CMAP = "Oranges"
 DIVERGING_CMAP = "PiYG"
+
+# geometries of tiles in maps: simplification tolerance (in degrees of EPSG:4326, e.g., 0.0001 ~ 10 m; 0: no simplification) and decimals of coordinates (~1 m)
+MAP_SIMPLIFY_TOLERANCE = 0.0001
+MAP_COORDINATE_PRECISION = 5
+# size and resolution of the small multiples of a map, e.g., one map for each time window
+MULTI_MAP_FIGSIZE = (18, 12)
+MULTI_MAP_DPI = 100
+# script with the tile geometries shared by all maps of a report
+TESSELLATION_ASSET = "tessellation.js"
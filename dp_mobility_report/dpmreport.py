@@ -2,17 +2,18 @@ import os
 import warnings
 from pathlib import Path
 from shutil import rmtree
-from typing import List, Optional, Union
+from typing import Iterable, List, Optional, Union
 
 import numpy as np
 import pandas as pd
 from geopandas import GeoDataFrame
-from pandarallel import pandarallel
 from pandas import DataFrame
 from tqdm.auto import tqdm
 
 from dp_mobility_report import constants as const
-from dp_mobility_report.model import preprocessing
+from dp_mobility_report.model import ingestion, preprocessing, preprocessing_cache
+from dp_mobility_report.model.true_aggregates import TrueAggregates
+from dp_mobility_report.model.user_aggregates import UserAggregates
 from dp_mobility_report.report import report
 from dp_mobility_report.report.html.templates import (
     create_html_assets,
@@ -25,7 +26,7 @@ class DpMobilityReport:
     """Generate a (differentially private) mobility report from a mobility dataset. The report will be generated as an HTML file, using the ``.to_file()`` method.
 
     Args:
-        df: ``DataFrame`` containing the mobility data. Expected columns: User ID ``uid``, trip ID ``tid``, timestamp ``datetime`` (or ``int`` to indicate sequence position, if dataset only consists of sequences without timestamps), latitude ``lat`` and longitude ``lng`` in CRS EPSG:4326.
+        df: ``DataFrame`` containing the mobility data. Expected columns: User ID ``uid``, trip ID ``tid``, timestamp ``datetime`` (or ``int`` to indicate sequence position, if dataset only consists of sequences without timestamps), latitude ``lat`` and longitude ``lng`` in CRS EPSG:4326. Data that does not fit into memory can be given as a path to a ``.csv`` or ``.parquet`` file (requires ``pyarrow``) or as an iterable of ``DataFrame`` chunks: it is then read chunk by chunk and only the first and last record of each trip is kept.
         tessellation: Geopandas ``GeoDataFrame`` containing the tessellation for spatial aggregations. Expected columns: ``tile_id``. If tessellation is not provided in the expected default CRS EPSG:4326, it will automatically be transformed. If no tessellation is provided, all analyses based on the tessellation will automatically be removed.
         privacy_budget: privacy_budget for the differentially private report. Defaults to ``None``, i.e., no privacy guarantee is provided.
         user_privacy: Whether item-level or user-level privacy is applied. Defaults to ``True`` (user-level privacy).
@@ -50,10 +51,16 @@ class DpMobilityReport:
         evalu: Parameter only needed for development and evaluation purposes. Defaults to ``False``.
         gaussian: Whether the Gaussian Mechanism should be applied instead of LaPlace. Defaults to ``False``.
         delta: The probability of failing to achieve epsilon-dp. Only needed if Gaussian Mechanism is chosen. Has to be of type float and in range (0,1].  Defaults to ``None``. i.e. standard Noise Mechanisms are used
-        evalu_analysis_selection_count: Fake count of selcted analyses for evaluation purposes. Defaults to ``None``."""
+        evalu_analysis_selection_count: Fake count of selcted analyses for evaluation purposes. Defaults to ``None``.
+        n_jobs: Number of threads to compute the report elements (i.e., analyses) concurrently. ``-1`` uses all available cores. Defaults to ``1``.
+        seed_noise: Provide seed for the noise of the differentially private analyses so that the report is reproducible. Only use for development and evaluation purposes: a published report should never be created with a known seed. Defaults to ``None``, i.e., no seed.
+        cache_dir: Directory to cache the preprocessed data in. Reports on the same data, tessellation and sampling parameters reuse the cached data instead of repeating the preprocessing. Input files are identified by their path, size and modification time, i.e., they are not read again for cached data. The cache is not used for a down-sampling (according to ``max_trips_per_user``) without ``seed_sampling``. Defaults to ``None``, i.e., no caching.
+        chunk_size: Number of records per chunk, if ``df`` is given as a file path. Defaults to ``1_000_000``."""
     _report: dict = {}
     _html: str = ""
     _df: DataFrame
+    _user_aggregates: Optional[UserAggregates] = None
+    _true_aggregates: Optional[TrueAggregates] = None
     _tessellation: Optional[GeoDataFrame]
     _privacy_budget: Optional[Union[int, float]]
     _max_trips_per_user: int
@@ -62,7 +69,7 @@ class DpMobilityReport:
 
     def __init__(
         self,
-        df: DataFrame,
+        df: Union[DataFrame, str, Path, Iterable[DataFrame]],
         tessellation: Optional[GeoDataFrame] = None,
         privacy_budget: Optional[Union[int, float]] = None,
         user_privacy: bool = True,
@@ -88,6 +95,10 @@ class DpMobilityReport:
         gaussian: bool = False,
         delta: Union[float, None] = None,
         evalu_analysis_selection_count: Optional[int] = None,
+        n_jobs: int = 1,
+        seed_noise: Optional[int] = None,
+        cache_dir: Optional[Union[str, Path]] = None,
+        chunk_size: int = 1_000_000,
     ) -> None:
         preprocessing.validate_input(
             df,
@@ -114,7 +125,11 @@ class DpMobilityReport:
             seed_sampling,
             gaussian,
             delta,
-            evalu_analysis_selection_count
+            evalu_analysis_selection_count,
+            n_jobs,
+            seed_noise,
+            cache_dir,
+            chunk_size,
         )
 
         (
@@ -136,23 +151,58 @@ class DpMobilityReport:
             )
             pbar.update()
 
-            self._max_trips_per_user = (
-                max_trips_per_user
-                if max_trips_per_user is not None
-                else df.groupby(const.UID).nunique()[const.TID].max()  ## if max_trips_per_user is none get actually max trips one single user contributed
+            # files are looked up in the cache before they are read, chunks can only be identified by their content
+            if not isinstance(df, (DataFrame, str, Path)):
+                df = ingestion.read_trip_ends(df, chunk_size)
+
+            # a random down-sampling (without seed) must not be reused from the cache
+            cache_key = (
+                preprocessing_cache.fingerprint(
+                    df, self._tessellation, max_trips_per_user, user_privacy, seed_sampling
+                )
+                if cache_dir is not None
+                and (
+                    seed_sampling is not None
+                    or max_trips_per_user is None
+                    or not user_privacy
+                )
+                else None
+            )
+            cached = (
+                None
+                if cache_key is None
+                else preprocessing_cache.load(cache_dir, cache_key)
             )
 
+            if cached is not None:
+                self._max_trips_per_user, self._df = cached
+            else:
+                if not isinstance(df, DataFrame):
+                    df = ingestion.read_trip_ends(df, chunk_size)
+                self._max_trips_per_user = (
+                    max_trips_per_user
+                    if max_trips_per_user is not None
+                    else df.groupby(const.UID)[const.TID].nunique().max()  ## if max_trips_per_user is none get actually max trips one single user contributed
+                )
+                self._df = preprocessing.preprocess_data( ## return DataFrame
+                    # copy, to not overwrite users instance of df
+                    df.loc[
+                        :, [c for c in ingestion.INPUT_COLUMNS if c in df.columns]
+                    ],
+                    self.tessellation,
+                    self.max_trips_per_user,
+                    self.user_privacy,
+                    seed_sampling,
+                )
+                if cache_key is not None:
+                    preprocessing_cache.save(
+                        cache_dir, cache_key, (self._max_trips_per_user, self._df)
+                    )
+
             if user_privacy:
                 self.count_sensitivity_base = self._max_trips_per_user
             else:
                 self.count_sensitivity_base = 1 ## if no user level privacy
-            self._df = preprocessing.preprocess_data( ## return DataFrame
-                df.copy(),  # copy, to not overwrite users instance of df
-                self.tessellation,
-                self.max_trips_per_user,
-                self.user_privacy,
-                seed_sampling,
-            )
             pbar.update()
 
         self._privacy_budget = None if privacy_budget is None else float(privacy_budget)
@@ -182,9 +232,7 @@ class DpMobilityReport:
             ),
             has_od_flows=max(self.df[const.TID].value_counts())
             > 1,  # are there trips with more than a single record?
-            has_consecutive_user_trips=max(
-                self.df.groupby(const.UID).nunique()[const.TID]
-            )
+            has_consecutive_user_trips=self.user_aggregates.trips_per_user.max()
             > 1,
         )
         self._budget_split = preprocessing.clean_budget_split( ## haut aus dem Budgetsplit alle raus die von der analyse exkludiert werden müssen.
@@ -196,9 +244,8 @@ class DpMobilityReport:
         self.subtitle = subtitle
         self.gaussian = gaussian
         self.delta = delta
-
-        # initialize parallel processing
-        pandarallel.initialize(verbose=0)
+        self.n_jobs = n_jobs
+        self.seed_noise = seed_noise
 
     @property
     def report(self) -> dict:
@@ -212,6 +259,22 @@ class DpMobilityReport:
         """DataFrame containing the processed input mobility data of the report."""
         return self._df
 
+    @property
+    def user_aggregates(self) -> UserAggregates:
+        """Per-user aggregates of the processed data, computed lazily and shared by all user analyses."""
+        # aggregates are recomputed if the processed data has been replaced
+        if (self._user_aggregates is None) or (self._user_aggregates.df is not self._df):
+            self._user_aggregates = UserAggregates(self._df)
+        return self._user_aggregates
+
+    @property
+    def true_aggregates(self) -> TrueAggregates:
+        """Exact (noise-free) aggregates of the processed data, computed lazily and shared by all analyses. Use ``true_aggregates.release()`` to create further reports with different privacy settings without repeating the aggregation."""
+        # aggregates are recomputed if the processed data has been replaced
+        if (self._true_aggregates is None) or (self._true_aggregates.df is not self._df):
+            self._true_aggregates = TrueAggregates(self)
+        return self._true_aggregates
+
     @property
     def max_trips_per_user(self) -> int:
         """Maximum number of trips per user as specified in the parameters. If ``None`` was given, this equals the actual maximum according to the data."""
@@ -242,6 +305,8 @@ class DpMobilityReport:
         output_file: Union[str, Path],
         disable_progress_bar: Optional[bool] = None,
         top_n_flows: int = 100,
+        n_jobs: Optional[int] = None,
+        map_simplify_tolerance: float = const.MAP_SIMPLIFY_TOLERANCE,
     ) -> None:
         """Write the report to a file.
         By default a name is generated.
@@ -250,9 +315,13 @@ class DpMobilityReport:
             output_file: The name or the path of the file to store the ``html`` output.
             disable_progress_bar: if ``False``, no progress bar is shown.
             top_n_flows: Determines how many of the top ``n`` origin-destination flows are displayed. Defaults to 100.
+            n_jobs: Number of processes to render the segments of the report concurrently. ``-1`` uses all available cores. Defaults to ``None``, i.e., ``n_jobs`` of the report.
+            map_simplify_tolerance: Tolerance (in degrees) to simplify the tile geometries of the maps with. Borders shared by neighbouring tiles are simplified consistently, so that there are no gaps or overlaps. Defaults to ``0.0001`` (~10 m); ``0`` disables the simplification.
         """
         if disable_progress_bar is None:
             disable_progress_bar = self.disable_progress_bar
+        if n_jobs is None:
+            n_jobs = self.n_jobs
 
         if not isinstance(output_file, Path):
             output_file = Path(str(output_file))
@@ -279,7 +348,12 @@ class DpMobilityReport:
 
         # render html
         data, temp_map_folder = render_html(
-            self, filename, top_n_flows, disable_progress_bar
+            self,
+            filename,
+            top_n_flows,
+            disable_progress_bar,
+            n_jobs,
+            map_simplify_tolerance,
         )
 
         create_maps_folder(temp_map_folder, output_dir)
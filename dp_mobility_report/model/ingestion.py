@@ -0,0 +1,100 @@
+from pathlib import Path
+from typing import Iterable, Iterator, Union
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from dp_mobility_report import constants as const
+
+# columns of the input data that are used by the preprocessing
+INPUT_COLUMNS = [
+    const.UID,
+    const.TID,
+    const.DATETIME,
+    const.LAT,
+    const.LNG,
+    const.TILE_ID,
+]
+
+
+def read_trip_ends(
+    data: Union[str, Path, Iterable[DataFrame]], chunk_size: int
+) -> DataFrame:
+    """Read mobility data that does not fit into memory chunk by chunk and only keep the records needed by the analyses, i.e., the first and last record of each trip.
+    The result can be preprocessed like the full data, see ``preprocessing.preprocess_data()``.
+
+    Args:
+        data: Path to a ``.csv`` or ``.parquet`` file or an iterable of ``DataFrame`` chunks with the columns of the full data.
+        chunk_size: Number of records per chunk, if ``data`` is a file.
+
+    Returns:
+        ``DataFrame`` with the first and last record of each trip in their original order.
+    """
+    chunks = read_chunks(data, chunk_size) if isinstance(data, (str, Path)) else data
+    return reduce_to_trip_ends(chunks)
+
+
+def read_chunks(path: Union[str, Path], chunk_size: int) -> Iterator[DataFrame]:
+    path = Path(path)
+    if path.suffix == ".parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as ex:
+            raise ImportError(
+                "Reading '.parquet' files in chunks requires the package 'pyarrow'."
+            ) from ex
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+def reduce_to_trip_ends(chunks: Iterable[DataFrame]) -> DataFrame:
+    # trips that span several chunks are carried over with their first and last record of each chunk.
+    # The carry-over is reduced again whenever it has doubled in size, i.e., its size stays proportional to the number of trips.
+    carry_over: list = []
+    n_records = n_reduced = 0
+    for chunk in chunks:
+        if not isinstance(chunk, DataFrame):
+            raise TypeError("Not all chunks of 'df' are Pandas DataFrames.")
+        chunk = _trip_ends(chunk)
+        carry_over.append(chunk)
+        n_records += len(chunk)
+        if (len(carry_over) > 1) and (n_records > 2 * n_reduced):
+            carry_over = [_trip_ends(pd.concat(carry_over, ignore_index=True))]
+            n_records = n_reduced = len(carry_over[0])
+
+    if not carry_over:
+        raise ValueError("'df' does not contain any data.")
+    trip_ends = _trip_ends(pd.concat(carry_over, ignore_index=True))
+    return trip_ends.reset_index(drop=True)
+
+
+# first and last record (ordered by timestamp) of each combination of uid and tid, in the original order of records
+def _trip_ends(df: DataFrame) -> DataFrame:
+    for column in INPUT_COLUMNS[:-1]:
+        if column not in df.columns:
+            raise ValueError(f"Column '{column}' must be present in data.")
+    df = df.loc[:, [column for column in INPUT_COLUMNS if column in df.columns]]
+    # ids of chunks with different types are the same as str (as in the preprocessing), e.g., 1 in a chunk with only numeric ids and "1" in another chunk
+    for column in [const.UID, const.TID]:
+        if pd.core.dtypes.common.is_object_dtype(df[column]):
+            df[column] = df[column].astype(str)
+
+    # same order as in the preprocessing: missing timestamps last, ties in their original order
+    if not pd.core.dtypes.common.is_integer_dtype(df[const.DATETIME]):
+        try:
+            df[const.DATETIME] = pd.to_datetime(df[const.DATETIME])
+        except Exception as ex:
+            raise TypeError("Column 'datetime' cannot be cast to datetime.") from ex
+    datetime = df[const.DATETIME].to_numpy()
+    if np.issubdtype(datetime.dtype, np.datetime64):
+        datetime = datetime.view(np.int64)
+    order = np.lexsort((datetime, df[const.DATETIME].isna().to_numpy()))
+
+    trips = df[[const.UID, const.TID]].iloc[order]
+    is_trip_end = ~trips.duplicated(keep="first").to_numpy() | ~trips.duplicated(
+        keep="last"
+    ).to_numpy()
+    return df.iloc[np.sort(order[is_trip_end])]
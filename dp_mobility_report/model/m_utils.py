@@ -1,5 +1,7 @@
 import math
-from typing import List, Optional, Tuple, Type, Union
+import threading
+from functools import cached_property
+from typing import Any, List, Optional, Tuple, Type, Union
 
 import numpy as np
 import pandas as pd
@@ -9,12 +11,67 @@ from pandas import DataFrame, Series
 from dp_mobility_report.model.section import TupleSection
 from dp_mobility_report.privacy import diff_privacy
 
+EARTH_RADIUS_KM = 6371.0088  # mean earth radius, as used by `haversine`
+
+
+class locked_cached_property(cached_property):
+    """``cached_property`` that is computed only once, also if several threads access it at the same time (``cached_property`` has no lock since Python 3.12).
+    Each property of each instance has its own lock, so that different properties are still computed concurrently.
+    """
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        if instance is None:
+            return self
+        # dict.setdefault is atomic, i.e., all threads get the same lock
+        locks = instance.__dict__.setdefault("_property_locks", {})
+        with locks.setdefault(self.attrname, threading.Lock()):
+            # cached by another thread in the meantime
+            if self.attrname in instance.__dict__:
+                return instance.__dict__[self.attrname]
+            return super().__get__(instance, owner)
+
 
 def haversine_dist(coords: List[float]) -> float:
     # coords: provide coordinates as lat_start, lng_start, lat_end, lng_end
     return haversine((coords[0], coords[1]), (coords[2], coords[3])) # FutureWarning: Series.__getitem__ treating keys as positions is deprecated. In a future version, integer keys will always be treated as labels (consistent with DataFrame behavior). To access a value by position, use `ser.iloc[pos]`
 
 
+def _haversine_kernel(
+    lat_1: np.ndarray, lng_1: np.ndarray, lat_2: np.ndarray, lng_2: np.ndarray
+) -> np.ndarray:
+    lat_1, lng_1, lat_2, lng_2 = map(np.radians, (lat_1, lng_1, lat_2, lng_2))
+    d = (
+        np.sin((lat_2 - lat_1) * 0.5) ** 2
+        + np.cos(lat_1) * np.cos(lat_2) * np.sin((lng_2 - lng_1) * 0.5) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(d))
+
+
+def haversine_dists(
+    lat_1: Union[np.ndarray, Series],
+    lng_1: Union[np.ndarray, Series],
+    lat_2: Union[np.ndarray, Series],
+    lng_2: Union[np.ndarray, Series],
+    chunk_size: Optional[int] = 1_000_000,
+) -> np.ndarray:
+    # vectorized haversine distance in km between arrays of coordinates (same result as `haversine_dist` row by row)
+    # computed in chunks to limit the memory of intermediate arrays. If chunk_size is None, all at once.
+    lat_1, lng_1, lat_2, lng_2 = (
+        np.asarray(x, dtype=np.float64) for x in (lat_1, lng_1, lat_2, lng_2)
+    )
+    lat_1, lng_1, lat_2, lng_2 = np.broadcast_arrays(lat_1, lng_1, lat_2, lng_2)
+    n = lat_1.size
+    if (chunk_size is None) or (n <= chunk_size):
+        return _haversine_kernel(lat_1, lng_1, lat_2, lng_2)
+    dists = np.empty(n, dtype=np.float64)
+    for start in range(0, n, chunk_size):
+        chunk = slice(start, start + chunk_size)
+        dists[chunk] = _haversine_kernel(
+            lat_1[chunk], lng_1[chunk], lat_2[chunk], lng_2[chunk]
+        )
+    return dists
+
+
 
 def _round_up(n: Union[float, int], decimals: int = 0) -> float:
     multiplier = 10**decimals
@@ -55,12 +112,21 @@ def hist_section(
     epsi = get_epsi_or_deltai(evalu, eps, 6)
     epsi_quant = epsi * 5 if epsi is not None else None
 
-    series = Series(series) if isinstance(series, np.ndarray) else series
+    # sort once: dp bounds and quartiles, cutting outliers and binning all use the same sorted values
+    values = series.to_numpy() if isinstance(series, Series) else np.asarray(series)
+    values = values[~pd.isna(values)]
+    if np.any(values[1:] < values[:-1]):  # values that are already sorted are not sorted again
+        values = np.sort(values)
 
-    quartiles, moe_expmech = diff_privacy.quartiles_dp(series, epsi_quant, sensitivity)
-    series = cut_outliers(
-        series, min_value=quartiles["min"], max_value=quartiles["max"]
+    quartiles, moe_expmech = diff_privacy.sorted_quartiles_dp(
+        values, epsi_quant, sensitivity
     )
+    # cut outliers
+    values = values[
+        np.searchsorted(values, quartiles["min"], side="left") : np.searchsorted(
+            values, quartiles["max"], side="right"
+        )
+    ]
 
     # determine bins for histogram
     # hist_min and hist_max determine how the output histogram looks like
@@ -76,9 +142,9 @@ def hist_section(
         (bin_range == 1) or ((bin_range is None) and (hist_max - hist_min < 10))
     ):
         bins = np.array(range(int(quartiles["min"]), int(quartiles["max"]) + 1))
-        counts = np.bincount(series, minlength=int(quartiles["max"]) + 1)[
-            int(quartiles["min"]) :
-        ]
+        counts = np.diff(
+            np.searchsorted(values, np.append(bins, bins[-1] + 1), side="left")
+        )
 
         # sum all counts above hist max to single bin >max
         if bins[-1] > hist_max:
@@ -92,7 +158,7 @@ def hist_section(
     # if all values above defined max, create one histogram bin greater hist_max
     elif hist_min > hist_max:
         bins = np.array([hist_max, np.inf])
-        counts = np.array([len(series)])
+        counts = np.array([len(values)])
 
     # else use ranges for bins to create histogram
     else:
@@ -126,9 +192,14 @@ def hist_section(
             max_bins if max_bins > 2 else 2
         )  # make sure there are at least 2 bins for histogram function to work
 
-        hist = np.histogram(series, bins=max_bins, range=(hist_min, hist_max_input))
-        counts = hist[0]
-        bins = hist[1].astype(bin_type)
+        # same bins as np.histogram: [edge_i, edge_i+1), the last bin includes its right edge
+        edges = np.histogram_bin_edges(
+            values[:0], bins=max_bins, range=(hist_min, hist_max_input)
+        )
+        edge_positions = np.searchsorted(values, edges, side="left")
+        edge_positions[-1] = np.searchsorted(values, edges[-1], side="right")
+        counts = np.diff(edge_positions)
+        bins = edges.astype(bin_type)
 
         # sum all counts above hist max to single bin >max
         if bins[-1] > hist_max:
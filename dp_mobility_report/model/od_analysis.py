@@ -41,38 +41,19 @@ def get_od_flows(
 ) -> DfSection:
     sensitivity = dpmreport.count_sensitivity_base
     gaussian = dpmreport.gaussian
-    od_flows = (
-        od_shape[od_shape[const.TILE_ID].notna() & od_shape[const.TILE_ID_END].notna()]
-        .groupby([const.TILE_ID, const.TILE_ID_END])
-        .aggregate(flow=(const.TID, "count"))
-        .reset_index()
-        .rename(
-            columns={
-                const.TILE_ID: const.ORIGIN,
-                const.TILE_ID_END: const.DESTINATION,
-            }
-        )
-        .sort_values("flow", ascending=False)
-    )
 
     # margin of error
     moe = diff_privacy.margin_of_error(0.95, eps, delta, sensitivity, gaussian)
 
-    # fill all potential combinations with 0s for correct application of dp
-    full_tile_ids = np.unique(dpmreport.tessellation[const.TILE_ID])
-    full_combinations = list(map(np.ravel, np.meshgrid(full_tile_ids, full_tile_ids)))
-    od_flows = pd.DataFrame(
-        {const.ORIGIN: full_combinations[0], const.DESTINATION: full_combinations[1]}
-    ).merge(od_flows, on=[const.ORIGIN, const.DESTINATION], how="left")
-    od_flows.fillna(0, inplace=True)
-
-    od_flows[const.FLOW] = diff_privacy.counts_dp(
-        od_flows[const.FLOW].to_numpy(), eps, delta, sensitivity, gaussian, allow_negative=True
+    od_flows = _get_dp_od_flows(
+        od_shape,
+        np.unique(dpmreport.tessellation[const.TILE_ID]),
+        eps,
+        delta,
+        sensitivity,
+        gaussian,
     )
 
-    # remove all instances of 0 (and smaller) to reduce storage
-    od_flows = od_flows[od_flows["flow"] > 0]
-
     # eps and sensitivity currently not used
     cumsum = m_utils.cumsum(od_flows.flow.copy().to_numpy(), eps, sensitivity)
 
@@ -90,6 +71,58 @@ def get_od_flows(
     )
 
 
+def _get_dp_od_flows(
+    od_shape: pd.DataFrame,
+    tile_ids: np.ndarray,
+    eps: Optional[float],
+    delta: Optional[float],
+    sensitivity: int,
+    gaussian: bool,
+) -> pd.DataFrame:
+    # all potential combinations of tiles need to be noised for a correct application of dp.
+    # Instead of materializing all n_tiles x n_tiles cells, only observed flows are noised directly.
+    # For the unobserved cells (true count of 0), only those that become positive after noise are sampled.
+    # Each OD cell is identified by an integer code: origin_index * n_tiles + destination_index.
+    n_tiles = len(tile_ids)
+    origin_idx = pd.Categorical(od_shape[const.TILE_ID], categories=tile_ids).codes
+    destination_idx = pd.Categorical(
+        od_shape[const.TILE_ID_END], categories=tile_ids
+    ).codes
+    # only flows with origin and destination within the tessellation
+    inside = (origin_idx >= 0) & (destination_idx >= 0)
+    cells, flows = np.unique(
+        origin_idx[inside].astype(np.int64) * n_tiles + destination_idx[inside],
+        return_counts=True,
+    )
+
+    if eps is not None:
+        flows = diff_privacy.counts_dp(
+            flows, eps, delta, sensitivity, gaussian, allow_negative=True
+        )
+        zero_positions, zero_flows = diff_privacy.zero_counts_dp(
+            n_tiles * n_tiles - len(cells), eps, delta, sensitivity, gaussian
+        )
+        # map position among unobserved cells to cell code by skipping all observed cells
+        zero_cells = zero_positions + np.searchsorted(
+            cells - np.arange(len(cells)), zero_positions, side="right"
+        )
+        cells = np.append(cells, zero_cells)
+        flows = np.append(flows, zero_flows)
+
+    # remove all instances of 0 (and smaller) to reduce storage
+    positive = flows > 0
+    cells, flows = cells[positive], flows[positive]
+
+    od_flows = pd.DataFrame(
+        {
+            const.ORIGIN: tile_ids[cells // n_tiles],
+            const.DESTINATION: tile_ids[cells % n_tiles],
+            const.FLOW: flows,
+        }
+    )
+    return od_flows.sort_values(const.FLOW, ascending=False, ignore_index=True)
+
+
 def get_intra_tile_flows(od_flows: pd.DataFrame) -> int:
     return od_flows[(od_flows[const.ORIGIN] == od_flows[const.DESTINATION])].flow.sum()
 
@@ -118,10 +151,12 @@ def get_jump_length(
     od_shape: pd.DataFrame, dpmreport: "DpMobilityReport", eps: Optional[float], delta: Optional[float]
 ) -> TupleSection:
 
-    # parallel computation for speed up
-    jump_length = od_shape[
-        [const.LAT, const.LNG, const.LAT_END, const.LNG_END]
-    ].parallel_apply(m_utils.haversine_dist, axis=1)
+    jump_length = m_utils.haversine_dists(
+        od_shape[const.LAT],
+        od_shape[const.LNG],
+        od_shape[const.LAT_END],
+        od_shape[const.LNG_END],
+    )
     return m_utils.hist_section(
         jump_length,
         eps,
@@ -1,4 +1,3 @@
-import calendar
 import math
 from datetime import timedelta
 from typing import TYPE_CHECKING, Optional
@@ -27,13 +26,11 @@ def get_dataset_statistics(
     epsi = m_utils.get_epsi_or_deltai(dpmreport.evalu, eps, element_count)  ## nur durch 4, weil 2 von 6 Statistiken von den anderen abhängig sind
     deltai = m_utils.get_epsi_or_deltai(dpmreport.evalu, delta, 4)
 
+    true_statistics = dpmreport.true_aggregates.dataset_statistics
+
     # counts for complete and incomplete trips
-    points_per_trip = (
-        dpmreport.df.reset_index().groupby(const.TID).count()["index"].value_counts()
-    )
-    n_incomplete_trips = 0 if 1 not in points_per_trip else points_per_trip[1]
     n_incomplete_trips = diff_privacy.count_dp(
-        n_incomplete_trips,  ## real value
+        true_statistics[const.N_INCOMPLETE_TRIPS],  ## real value
         epsi,
         sensitivity=dpmreport.count_sensitivity_base,  ## max trips per user bei user-level privacy, wenn no privacy: 1
         gaussian=gaussian,
@@ -44,9 +41,8 @@ def get_dataset_statistics(
         0.95, epsi, deltai, dpmreport.count_sensitivity_base, gaussian
     )
 
-    n_complete_trips = 0 if 2 not in points_per_trip else points_per_trip[2]
     n_complete_trips = diff_privacy.count_dp(
-        n_complete_trips,
+        true_statistics[const.N_COMPLETE_TRIPS],
         epsi,
         2 * dpmreport.count_sensitivity_base,  ## 2 * max_trips_per_user
         gaussian=dpmreport.gaussian,
@@ -76,7 +72,7 @@ def get_dataset_statistics(
         ) / n_records
 
     n_users = diff_privacy.count_dp(
-        dpmreport.df[const.UID].nunique(), epsi, 1, nonzero=True,  gaussian=dpmreport.gaussian,
+        true_statistics[const.N_USERS], epsi, 1, nonzero=True,  gaussian=dpmreport.gaussian,
         delta=deltai,
     )
     moe_users = diff_privacy.margin_of_error(
@@ -84,7 +80,7 @@ def get_dataset_statistics(
     )
 
     n_locations = diff_privacy.count_dp(
-        dpmreport.df.groupby([const.LAT, const.LNG]).ngroups,
+        true_statistics[const.N_LOCATIONS],
         epsi,
         2 * dpmreport.count_sensitivity_base,
         nonzero=True,
@@ -129,7 +125,7 @@ def get_missing_values(
     epsi = m_utils.get_epsi_or_deltai(dpmreport.evalu, eps, element_count)
     deltai = m_utils.get_epsi_or_deltai(dpmreport.evalu, delta, len(columns))
 
-    missings = dict((len(dpmreport.df) - dpmreport.df.count())[columns])
+    missings = dict(dpmreport.true_aggregates.missing_values)
 
     moe = diff_privacy.margin_of_error(
         0.95, epsi, deltai, 2*dpmreport.count_sensitivity_base, gaussian
@@ -156,17 +152,15 @@ def get_trips_over_time(
     gaussian = dpmreport.gaussian
     deltai = m_utils.get_epsi_or_deltai(dpmreport.evalu, delta, 3)
 
-    df_trip = dpmreport.df[
-        (dpmreport.df[const.POINT_TYPE] == const.END)
-    ]  # only count each trip once
-    dp_bounds = diff_privacy.bounds_dp(
-        df_trip[const.DATETIME], epsi_limits, dpmreport.count_sensitivity_base
+    trip_ends = dpmreport.true_aggregates.trip_ends  # only count each trip once
+    dp_bounds = diff_privacy.sorted_bounds_dp(
+        trip_ends, epsi_limits, dpmreport.count_sensitivity_base
     )
 
     # cut based on dp min and max values
     (trips_over_time) = pd.DataFrame(
         m_utils.cut_outliers(  # don't disclose outliers to the as the boundaries are not defined through user input
-            df_trip[const.DATETIME],
+            trip_ends,
             min_value=dp_bounds[0],
             max_value=dp_bounds[1],
         )
@@ -229,27 +223,11 @@ def get_trips_over_time(
 def get_trips_per_weekday(
     dpmreport: "DpMobilityReport", eps: Optional[float], delta: Optional[float]
 ) -> SeriesSection:
-    dpmreport.df.loc[:, const.DATE] = dpmreport.df[const.DATETIME].dt.date
-    dpmreport.df.loc[:, const.DAY_NAME] = dpmreport.df[const.DATETIME].dt.day_name()
-    dpmreport.df.loc[:, const.WEEKDAY] = dpmreport.df[const.DATETIME].dt.weekday
     gaussian = dpmreport.gaussian
 
     trips_per_weekday = (
-        dpmreport.df[
-            dpmreport.df[const.POINT_TYPE] == const.END
-        ]  # count trips not records
-        .groupby([const.DAY_NAME], sort=False)
-        .count()[const.TID]
-    )
-    missing_days = set(calendar.day_name) - set(trips_per_weekday.index.tolist())
-    trips_per_weekday = pd.concat(
-        [trips_per_weekday, pd.Series(0, index=list(missing_days))]
-    )
-
-    trips_per_weekday.index = pd.Categorical(
-        trips_per_weekday.index, list(calendar.day_name)
-    )
-    trips_per_weekday.sort_index(inplace=True)
+        dpmreport.true_aggregates.trips_per_weekday
+    )  # count trips not records
 
     trips_per_weekday = pd.Series(
         index=trips_per_weekday.index,
@@ -280,54 +258,34 @@ def get_trips_per_hour(
     dpmreport: "DpMobilityReport", eps: Optional[float], delta: Optional[float]
 ) -> DfSection:
     gaussian = dpmreport.gaussian
-    hour_weekday = dpmreport.df.groupby(
-        [const.HOUR, const.IS_WEEKEND, const.POINT_TYPE]
-    ).count()[const.TID]
-    hour_weekday.name = "count"
-
-    # create all potential combinations
-    full_combination = pd.DataFrame(
-        list(
-            map(
-                np.ravel,
-                np.meshgrid(
-                    range(0, 24),
-                    [const.WEEKDAY, const.WEEKEND],
-                    [const.START, const.END],
-                ),
-            )
-        )
-    ).T
-    full_combination.columns = [const.HOUR, const.IS_WEEKEND, const.POINT_TYPE]
-    full_combination["count"] = 0
-    full_combination.set_index(
-        [const.HOUR, const.IS_WEEKEND, const.POINT_TYPE], inplace=True
-    )
-
-    hour_weekday = full_combination.add(pd.DataFrame(hour_weekday), fill_value=0)
-
-    hour_weekday = hour_weekday.reset_index()
-    hour_weekday["count"] = diff_privacy.counts_dp(
-        hour_weekday["count"], eps, delta, dpmreport.count_sensitivity_base, gaussian
-    )
+    # counts of all potential combinations: hour x (weekday, weekend) x (end, start)
+    hour_weekday = diff_privacy.counts_dp(
+        dpmreport.true_aggregates.trips_per_hour, eps, delta, dpmreport.count_sensitivity_base, gaussian
+    ).reshape(24, 2, 2)
 
-    hour_weekday[const.TIME_CATEGORY] = (
-        hour_weekday[const.IS_WEEKEND] + " " + hour_weekday[const.POINT_TYPE]
-    )
     moe = diff_privacy.margin_of_error(
         0.95, eps, delta, dpmreport.count_sensitivity_base, gaussian
     )
 
     # as percent instead of absolute values
-    trip_sum = np.sum(
-        hour_weekday[hour_weekday.point_type == const.END]["count"]
-    )  # only use ends to get sum of trips
+    trip_sum = np.sum(hour_weekday[:, :, 0])  # only use ends to get sum of trips
     if trip_sum != 0:
-        hour_weekday["perc"] = hour_weekday["count"] / trip_sum * 100
+        hour_weekday = hour_weekday / trip_sum * 100
         moe = moe / trip_sum * 100
 
+    time_categories = [
+        f"{weekday} {point_type}"
+        for weekday in [const.WEEKDAY, const.WEEKEND]
+        for point_type in [const.END, const.START]
+    ]
     return DfSection(
-        data=hour_weekday[[const.HOUR, const.TIME_CATEGORY, "perc"]],
+        data=pd.DataFrame(
+            {
+                const.HOUR: np.repeat(np.arange(24), len(time_categories)),
+                const.TIME_CATEGORY: np.tile(time_categories, 24).astype(object),
+                "perc": hour_weekday.ravel().astype(float),
+            }
+        ),
         privacy_budget=eps,
         margin_of_error_laplace=moe,
     )
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -21,27 +21,11 @@ def get_visits_per_tile(
     gaussian = dpmreport.gaussian
 
     sensitivity = 2 * dpmreport.count_sensitivity_base
-    # count number of visits for each location
-    visits_per_tile = (
-        dpmreport.df[
-            dpmreport.df[const.TILE_ID].isin(dpmreport.tessellation.tile_id)
-        ]  # only include records within tessellation
-        .groupby(const.TILE_ID)
-        .aggregate(visits=(const.TILE_ID, "count"))
-        .sort_values("visits", ascending=False)
-        .reset_index()
-    )
+    # number of visits for each location
+    visits_per_tile = dpmreport.true_aggregates.visits_per_tile.copy()
 
     # number of records outside of the tessellation
-    n_outliers = int(len(dpmreport.df) - visits_per_tile.visits.sum())
-
-    visits_per_tile = visits_per_tile.merge(
-        dpmreport.tessellation[[const.TILE_ID, const.TILE_NAME]],
-        on=const.TILE_ID,
-        how="outer",
-    ).sort_values("visits", ascending=False)
-    
-    visits_per_tile.loc[visits_per_tile.visits.isna(), "visits"] = 0
+    n_outliers = dpmreport.true_aggregates.n_outside_tessellation
 
     visits_per_tile["visits"] = diff_privacy.counts_dp(
         visits_per_tile["visits"].values,
@@ -88,63 +72,53 @@ def _get_hour_bin(hour: int, timewindows: np.ndarray) -> str:
     return f"{i + 1}: {min_v}-{max_v}"
 
 
+def _hour_bins(timewindows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # lookup table of the time window code for each hour of the day (0-23)
+    # codes refer to the (sorted) time window labels
+    labels, hour_to_window = np.unique(
+        [_get_hour_bin(hour, timewindows) for hour in range(24)],
+        return_inverse=True,
+    )
+    return hour_to_window, labels
+
+
 def get_visits_per_time_tile(
     dpmreport: "DpMobilityReport",
     eps: Optional[float],
     delta: Optional[float],
     # trip_count: Optional[int], outlier_count: Optional[None]
 ) -> DfSection:
-    dpmreport.df["timewindows"] = dpmreport.df[const.HOUR].apply(
-        lambda x: _get_hour_bin(x, dpmreport.timewindows)
-    )
-
     gaussian = dpmreport.gaussian
 
-    # only points within tessellation and end points
-    counts_per_tile_timewindow = dpmreport.df[
-        (dpmreport.df[const.POINT_TYPE] == const.END)
-        & dpmreport.df[const.TILE_ID].isin(dpmreport.tessellation[const.TILE_ID])
-    ][[const.TILE_ID, const.IS_WEEKEND, "timewindows"]]
+    (
+        counts_per_tile_timewindow,
+        is_weekend,
+        timewindows,
+        tile_ids,
+    ) = dpmreport.true_aggregates.visits_per_time_tile
 
     moe = diff_privacy.margin_of_error(
         0.95, eps, delta, dpmreport.count_sensitivity_base, gaussian
     )
 
-    # create full combination of all times and tiles for application of dp
-    tile_ids = dpmreport.tessellation[const.TILE_ID].unique()
-    is_weekend = dpmreport.df[const.IS_WEEKEND].unique()
-    timewindows = dpmreport.df.timewindows.unique()
-    full_combination = pd.DataFrame(
-        list(map(np.ravel, np.meshgrid(tile_ids, is_weekend, timewindows))),
-        index=[const.TILE_ID, const.IS_WEEKEND, "timewindows"],
-    ).T
-    counts_per_tile_timewindow = pd.concat(
-        [counts_per_tile_timewindow, full_combination]
-    )
-
-    counts_per_tile_timewindow = (
-        counts_per_tile_timewindow.reset_index()
-        .pivot_table(
-            index=const.TILE_ID,
-            columns=[const.IS_WEEKEND, "timewindows"],
-            aggfunc="count",
-        )
-        .droplevel(level=0, axis=1)
-    )
-
-    # remove instance from full_combination
-    counts_per_tile_timewindow = counts_per_tile_timewindow.dropna() - 1
-    counts_per_tile_timewindow = counts_per_tile_timewindow.unstack()
-
-    counts_per_tile_timewindow = pd.Series(
-        index=counts_per_tile_timewindow.index,
-        data=diff_privacy.counts_dp(
-            counts_per_tile_timewindow.values, eps, delta, dpmreport.count_sensitivity_base, gaussian
-        ),
+    counts_per_tile_timewindow = diff_privacy.counts_dp(
+        counts_per_tile_timewindow.ravel(),
+        eps,
+        delta,
+        dpmreport.count_sensitivity_base,
+        gaussian,
     )
 
     return DfSection(
-        data=counts_per_tile_timewindow.unstack(const.TILE_ID).T,
+        data=pd.DataFrame(
+            counts_per_tile_timewindow.reshape(-1, len(tile_ids)).T,
+            index=pd.Index(tile_ids, name=const.TILE_ID),
+            columns=pd.MultiIndex.from_product(
+                [is_weekend, timewindows],
+                names=[const.IS_WEEKEND, "timewindows"],
+            ),
+            copy=True,  # do not share memory with the cached true counts
+        ),
         privacy_budget=eps,
         margin_of_error_laplace=moe,
     )
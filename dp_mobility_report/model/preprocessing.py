@@ -1,13 +1,15 @@
+import itertools
 import logging
 import warnings
-from typing import Any, List, Optional, Tuple, Union
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Tuple, Union
 
 import geopandas as gpd
 import numpy as np
 import pandas as pd
+import shapely
 from geopandas import GeoDataFrame
 from pandas import DataFrame
-from shapely.geometry import Point
 
 from dp_mobility_report import constants as const
 
@@ -41,7 +43,7 @@ def validate_inclusion_exclusion(
 
 
 def validate_input(
-    df: DataFrame,
+    df: Union[DataFrame, str, Path, Iterable[DataFrame]],
     tessellation: Optional[GeoDataFrame],
     privacy_budget: Optional[Union[int, float]],
     max_trips_per_user: Optional[int],
@@ -66,9 +68,18 @@ def validate_input(
     gaussian: bool,
     delta: Union[float, None],
     evalu_analysis_selection_count: Optional[int] = None,
+    n_jobs: int = 1,
+    seed_noise: Optional[int] = None,
+    cache_dir: Optional[Union[str, Path]] = None,
+    chunk_size: int = 1_000_000,
 ) -> None:
-    if not isinstance(df, DataFrame):
-        raise TypeError("'df' is not a Pandas DataFrame.")
+    if isinstance(df, (str, Path)):
+        if Path(df).suffix not in [".csv", ".parquet"]:
+            raise TypeError(
+                "'df' is not a Pandas DataFrame or a path to a '.csv' or '.parquet' file."
+            )
+    elif not isinstance(df, (DataFrame, Iterable)):
+        raise TypeError("'df' is not a Pandas DataFrame or an iterable of DataFrames.")
 
     if tessellation is None:
         warnings.warn(
@@ -171,6 +182,24 @@ def validate_input(
     if (seed_sampling is not None) and (seed_sampling <= 0):
         raise ValueError("'seed_sampling' has to be greater 0.")
 
+    if not ((seed_noise is None) or isinstance(seed_noise, int)):
+        raise TypeError("'seed_noise' is not an integer.")
+    if (seed_noise is not None) and (seed_noise <= 0):
+        raise ValueError("'seed_noise' has to be greater 0.")
+
+    if not isinstance(n_jobs, int):
+        raise TypeError("'n_jobs' is not an integer.")
+    if (n_jobs <= 0) and (n_jobs != -1):
+        raise ValueError("'n_jobs' has to be greater 0 or -1 (all cores).")
+
+    if not ((cache_dir is None) or isinstance(cache_dir, (str, Path))):
+        raise TypeError("'cache_dir' is not a string or a Path.")
+
+    if not isinstance(chunk_size, int):
+        raise TypeError("'chunk_size' is not an integer.")
+    if chunk_size <= 0:
+        raise ValueError("'chunk_size' has to be greater 0.")
+
     if (not gaussian) and (delta is not None):
         warnings.warn("Input parameter 'delta' is set, but will never be used because gaussian is not chosen")
     if gaussian and (delta is None):
@@ -182,6 +211,25 @@ def validate_input(
         raise ValueError("'evalu_analysis_selection_count' can not be 0 because 0 would not be realistic.")
 
 
+def validate_release_input(
+    privacy_budget: Optional[Union[int, float]],
+    gaussian: bool,
+    delta: Optional[float],
+    seed_noise: Optional[int],
+) -> None:
+    if privacy_budget is not None:
+        _validate_numeric_greater_zero(
+            privacy_budget, f"{privacy_budget=}".split("=")[0]
+        )
+    _validate_bool(gaussian, f"{gaussian=}".split("=")[0])
+    _validate_delta(delta, f"{delta=}".split("=")[0])
+
+    if not ((seed_noise is None) or isinstance(seed_noise, int)):
+        raise TypeError("'seed_noise' is not an integer.")
+    if (seed_noise is not None) and (seed_noise <= 0):
+        raise ValueError("'seed_noise' has to be greater 0.")
+
+
 def _validate_delta(var: Any, name: str)-> None:
     if not ((var is None) or isinstance(var, float)):
         raise TypeError(f"{name} is not an float.")
@@ -343,7 +391,7 @@ def preprocess_tessellation(tessellation: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
 def _validate_columns(df: pd.DataFrame) -> pd.DataFrame:
     if const.UID not in df.columns:
         raise ValueError("Column 'uid' must be present in data.")
-    df[const.UID] = df[const.UID].astype(str)
+    df[const.UID] = _to_str_categorical(df[const.UID])
     if const.TID not in df.columns:
         raise ValueError("Column 'tid' must be present in data.")
     if const.LAT not in df.columns:
@@ -368,6 +416,27 @@ def _validate_columns(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+# labels are only kept once as categories, records hold integer codes
+def _to_str_categorical(
+    series: pd.Series, categories: Optional[pd.Index] = None
+) -> pd.Series:
+    if (categories is None) and series.hasnans:
+        # missing values become "nan"
+        series = series.astype(str)
+    series = series.astype("category")
+    labels = series.cat.categories.astype(str)
+    if not labels.is_unique:
+        # e.g., 1 and "1" are the same label as str
+        series = series.astype(str).astype("category")
+        labels = series.cat.categories
+    series = series.cat.rename_categories(labels)
+    if categories is not None:
+        series = series.cat.set_categories(
+            categories.append(labels.difference(categories))
+        )
+    return series
+
+
 def preprocess_data(
     df: pd.DataFrame,
     tessellation: Optional[gpd.GeoDataFrame],
@@ -379,11 +448,19 @@ def preprocess_data(
 
     df.loc[:, const.ID] = range(0, len(df))
 
+    # single sort: trip ids are renumbered and first / last records of trips are determined in this order
+    datetime = df[const.DATETIME].to_numpy()
+    if np.issubdtype(datetime.dtype, np.datetime64):
+        datetime = datetime.view(np.int64)
+    df = df.iloc[
+        np.lexsort((datetime, df[const.DATETIME].isna(), df[const.UID].cat.codes))
+    ]
+
     # make sure trip ids are unique and ordered correctly
     df[const.TID] = (
-        df.sort_values([const.UID, const.DATETIME])
-        .groupby([const.UID, const.TID], sort=False)
+        df.groupby([const.UID, const.TID], sort=False, observed=True)
         .ngroup()
+        .astype(np.int32)
     )
 
     # remove unnessessary columns
@@ -392,24 +469,26 @@ def preprocess_data(
         columns.append(const.TILE_ID)
     df = df.loc[:, columns]
 
+    # remove waypoints, i.e., only keep the first and last record of each trip
+    is_start = ~df[const.TID].duplicated(keep="first").to_numpy()
+    is_end = ~df[const.TID].duplicated(keep="last").to_numpy()
+    df = df[is_start | is_end]
+
+    # assign start and end as point_type (a trip with a single record only has an end)
+    df[const.POINT_TYPE] = pd.Categorical.from_codes(
+        is_end[is_start | is_end].astype(np.int8), categories=[const.START, const.END]
+    )
+
     # only create time realted variables if df has timestamps
     if pd.core.dtypes.common.is_datetime64_dtype(df[const.DATETIME]):
         # create time related variables
-        df.loc[:, const.HOUR] = df[const.DATETIME].dt.hour
-        df.loc[:, const.IS_WEEKEND] = np.select(
-            [df[const.DATETIME].dt.weekday > 4], ["weekend"], default="weekday"
+        # records without (valid) timestamp have a missing hour
+        df[const.HOUR] = df[const.DATETIME].dt.hour.astype("Int8")
+        df[const.IS_WEEKEND] = pd.Categorical.from_codes(
+            (df[const.DATETIME].dt.weekday > 4).astype(np.int8),
+            categories=[const.WEEKDAY, const.WEEKEND],
         )
 
-    # remove waypoints
-    df = df.sort_values(const.DATETIME).groupby(const.TID, as_index=False).nth([0, -1]) ## Zwischenstopps entfernen -> schwer zu anonymisieren
-
-    # assign start and end as point_type
-    df[const.POINT_TYPE] = "start"
-    df.sort_values(const.DATETIME, inplace=True)
-    df.loc[
-        df.groupby(const.TID)[const.POINT_TYPE].tail(1).index, const.POINT_TYPE
-    ] = "end"
-
     # if tile assignment isn't already provided, recompute assignment
     if tessellation is not None:
         if const.TILE_ID not in df.columns:
@@ -418,7 +497,12 @@ def preprocess_data(
             logging.info(
                 "'tile_id' present in data. No new assignment of points to tessellation."
             )
-            df[const.TILE_ID] = df[const.TILE_ID].astype(str)
+        # tiles of the tessellation come first, i.e., their codes match the tessellation's order
+        df[const.TILE_ID] = _to_str_categorical(
+            df[const.TILE_ID], pd.Index(tessellation[const.TILE_ID].astype(str))
+        )
+        if const.TILE_NAME in df.columns:
+            df[const.TILE_NAME] = df[const.TILE_NAME].astype("category")
 
     df = sample_trips(df, max_trips_per_user, user_privacy, seed)
     return df
@@ -427,20 +511,167 @@ def preprocess_data(
 def assign_points_to_tessellation(
     df: pd.DataFrame, tessellation: gpd.GeoDataFrame
 ) -> pd.DataFrame:
-    gdf = gpd.GeoDataFrame(
-        df,
-        geometry=[Point(xy) for xy in zip(df[const.LNG], df[const.LAT])],
-        crs="EPSG:4326",
+    lngs = df[const.LNG].to_numpy(dtype=np.float64)
+    lats = df[const.LAT].to_numpy(dtype=np.float64)
+
+    grid = _regular_grid(tessellation)
+    if grid is not None:
+        tile_index = _tile_index_in_grid(lngs, lats, *grid)
+    else:
+        # only look up each location once
+        location_codes, locations = pd.factorize(
+            lngs + 1j * lats, use_na_sentinel=False
+        )
+        tile_index = _tile_index_in_polygons(
+            locations.real, locations.imag, tessellation
+        )[location_codes]
+
+    return df.assign(
+        **{
+            const.TILE_ID: _take_tiles(tessellation[const.TILE_ID], tile_index),
+            const.TILE_NAME: _take_tiles(tessellation[const.TILE_NAME], tile_index),
+        }
     )
 
-    # Spatial join points to polygons
-    df = gpd.sjoin(
-        tessellation[[const.TILE_ID, const.TILE_NAME, const.GEOMETRY]],
-        gdf,
-        how="right",
+
+# position of the (first) tile that contains each point, -1 if no tile contains the point
+def _tile_index_in_polygons(
+    lngs: np.ndarray, lats: np.ndarray, tessellation: gpd.GeoDataFrame
+) -> np.ndarray:
+    tree = shapely.STRtree(np.asarray(tessellation.geometry))
+    point_index, tile_index = tree.query(
+        gpd.points_from_xy(lngs, lats), predicate="intersects"
+    )
+    order = np.lexsort((tile_index, point_index))
+    point_index, first_match = np.unique(point_index[order], return_index=True)
+    tile_index_by_point = np.full(len(lngs), -1, dtype=np.int64)
+    tile_index_by_point[point_index] = tile_index[order][first_match]
+    return tile_index_by_point
+
+
+# same result as ``_tile_index_in_polygons()``: tiles are closed, i.e., a point on a border of several tiles gets the first of them
+def _tile_index_in_grid(
+    lngs: np.ndarray,
+    lats: np.ndarray,
+    min_lng: float,
+    min_lat: float,
+    width: float,
+    height: float,
+    grid_tile_index: np.ndarray,
+    tile_bounds: np.ndarray,
+) -> np.ndarray:
+    n_rows, n_cols = grid_tile_index.shape
+    # cells far outside of the grid (or of points without coordinates) are clipped, as they cannot contain the point anyway
+    with np.errstate(invalid="ignore"):
+        cols = np.nan_to_num(
+            np.clip(np.floor((lngs - min_lng) / width), -2, n_cols + 1), nan=-2
+        ).astype(np.int64)
+        rows = np.nan_to_num(
+            np.clip(np.floor((lats - min_lat) / height), -2, n_rows + 1), nan=-2
+        ).astype(np.int64)
+
+    # points in the interior of the tile of their cell only intersect this tile
+    tile_index = _grid_cell_tile(rows, cols, grid_tile_index)
+    bounds = tile_bounds[tile_index]
+    in_interior = (
+        (tile_index >= 0)
+        & (bounds[:, 0] < lngs)
+        & (lngs < bounds[:, 2])
+        & (bounds[:, 1] < lats)
+        & (lats < bounds[:, 3])
+    )
+    tile_index[~in_interior] = -1
+
+    # other points might be on borders: the first of all adjacent tiles that contains the point
+    on_border = np.flatnonzero(~in_interior)
+    lngs, lats = lngs[on_border], lats[on_border]
+    rows, cols = rows[on_border], cols[on_border]
+    no_tile = len(tile_bounds)
+    border_tile_index = np.full(len(on_border), no_tile, dtype=np.int64)
+    for row_offset, col_offset in itertools.product([-1, 0, 1], repeat=2):
+        candidates = _grid_cell_tile(
+            rows + row_offset, cols + col_offset, grid_tile_index
+        )
+        bounds = tile_bounds[candidates]
+        contains = (
+            (candidates >= 0)
+            & (bounds[:, 0] <= lngs)
+            & (lngs <= bounds[:, 2])
+            & (bounds[:, 1] <= lats)
+            & (lats <= bounds[:, 3])
+        )
+        border_tile_index[contains] = np.minimum(
+            border_tile_index[contains], candidates[contains]
+        )
+    border_tile_index[border_tile_index == no_tile] = -1
+    tile_index[on_border] = border_tile_index
+    return tile_index
+
+
+# tile position of each grid cell, -1 if there is no tile or the cell is outside of the grid
+def _grid_cell_tile(
+    rows: np.ndarray, cols: np.ndarray, grid_tile_index: np.ndarray
+) -> np.ndarray:
+    n_rows, n_cols = grid_tile_index.shape
+    in_grid = (rows >= 0) & (rows < n_rows) & (cols >= 0) & (cols < n_cols)
+    tile_index = np.full(len(rows), -1, dtype=np.int64)
+    tile_index[in_grid] = grid_tile_index[rows[in_grid], cols[in_grid]]
+    return tile_index
+
+
+# if all tiles are equally sized, axis-aligned rectangles on a common grid,
+# return the grid's origin, cell size, the tile position of each grid cell (-1 if there is no tile) and the bounds of each tile
+def _regular_grid(tessellation: gpd.GeoDataFrame) -> Optional[tuple]:
+    bounds = tessellation.geometry.bounds.to_numpy()
+    if (len(bounds) == 0) or np.isnan(bounds).any():
+        return None
+    widths = bounds[:, 2] - bounds[:, 0]
+    heights = bounds[:, 3] - bounds[:, 1]
+    width, height = widths[0], heights[0]
+    if (
+        (width <= 0)
+        or (height <= 0)
+        or not np.allclose(widths, width, rtol=1e-6, atol=0)
+        or not np.allclose(heights, height, rtol=1e-6, atol=0)
+        # a rectangle fills its bounding box
+        or not np.allclose(
+            shapely.area(np.asarray(tessellation.geometry)),
+            widths * heights,
+            rtol=1e-6,
+            atol=0,
+        )
+    ):
+        return None
+
+    min_lng, min_lat = bounds[:, 0].min(), bounds[:, 1].min()
+    cols = (bounds[:, 0] - min_lng) / width
+    rows = (bounds[:, 1] - min_lat) / height
+    if not (
+        np.allclose(cols, np.rint(cols), rtol=0, atol=1e-6)
+        and np.allclose(rows, np.rint(rows), rtol=0, atol=1e-6)
+    ):
+        return None
+    cols = np.rint(cols).astype(np.int64)
+    rows = np.rint(rows).astype(np.int64)
+    n_cells = (rows.max() + 1) * (cols.max() + 1)
+    # sparse grids are looked up as polygons
+    if n_cells > 4 * len(bounds):
+        return None
+
+    grid_tile_index = np.full((rows.max() + 1, cols.max() + 1), -1, dtype=np.int64)
+    grid_tile_index[rows, cols] = np.arange(len(bounds))
+    if (grid_tile_index >= 0).sum() != len(bounds):  # overlapping tiles
+        return None
+    return min_lng, min_lat, width, height, grid_tile_index, bounds
+
+
+def _take_tiles(values: pd.Series, tile_index: np.ndarray) -> pd.Categorical:
+    categories = pd.Index(values)
+    if categories.is_unique and not categories.hasnans:
+        return pd.Categorical.from_codes(tile_index, categories=categories)
+    return pd.Categorical(
+        pd.api.extensions.take(values.to_numpy(), tile_index, allow_fill=True)
     )
-    df.drop(["index_left", const.GEOMETRY], axis=1, inplace=True)
-    return pd.DataFrame(df)
 
 
 def sample_trips(
@@ -450,24 +681,16 @@ def sample_trips(
     seed: Optional[int],
 ) -> pd.DataFrame:
     if user_privacy:
-        if seed is not None:
-            np.random.seed(seed)
-        tid_sample = (
+        # shuffle trips, so that the first trips of each user are a random sample
+        trips = (
             df[[const.UID, const.TID]]
             .drop_duplicates(const.TID)
-            .groupby(const.UID)[const.TID]
-            .apply(
-                lambda x: np.random.choice(
-                    x,
-                    size=(
-                        max_trips_per_user if max_trips_per_user < len(x) else len(x)
-                    ),
-                    replace=False,
-                )
-            )
+            .sample(frac=1, random_state=np.random.default_rng(seed))
         )
-        return df.loc[
-            df[const.TID].isin(np.concatenate(tid_sample.values))
+        tid_sample = trips.loc[
+            trips.groupby(const.UID, observed=True).cumcount() < max_trips_per_user,
+            const.TID,
         ]
+        return df.loc[df[const.TID].isin(tid_sample)]
     else:
         return df
@@ -0,0 +1,83 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Optional, Union
+
+import pandas as pd
+import shapely
+from geopandas import GeoDataFrame
+
+import dp_mobility_report
+
+
+def fingerprint(
+    data: Union[pd.DataFrame, str, Path],
+    tessellation: Optional[GeoDataFrame],
+    max_trips_per_user: Optional[int],
+    user_privacy: bool,
+    seed_sampling: Optional[int],
+) -> str:
+    """Hash of the raw data, the (preprocessed) tessellation and all parameters that determine the preprocessed data.
+    Files are identified by their path, size and modification time, i.e., they are not read for the lookup. Changes of a file invalidate the cache.
+    The package version is part of the hash, so that changes of the preprocessing invalidate the cache.
+    """
+    sha = hashlib.sha256()
+    sha.update(
+        repr(
+            (
+                dp_mobility_report.__version__,
+                max_trips_per_user,
+                user_privacy,
+                seed_sampling,
+            )
+        ).encode()
+    )
+    if isinstance(data, (str, Path)):
+        stat = os.stat(data)
+        sha.update(
+            repr((str(Path(data).resolve()), stat.st_size, stat.st_mtime_ns)).encode()
+        )
+    else:
+        sha.update(repr((list(data.columns), list(data.dtypes.astype(str)))).encode())
+        sha.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+
+    if tessellation is not None:
+        sha.update(str(tessellation.crs).encode())
+        sha.update(
+            pd.util.hash_pandas_object(
+                pd.DataFrame(tessellation.drop(columns=tessellation.geometry.name)),
+                index=True,
+            )
+            .to_numpy()
+            .tobytes()
+        )
+        for wkb in shapely.to_wkb(tessellation.geometry.to_numpy()):
+            sha.update(wkb)
+    return sha.hexdigest()
+
+
+def _cache_file(cache_dir: Union[str, Path], key: str) -> Path:
+    return Path(cache_dir) / f"preprocessed_{key}.pkl"
+
+
+def load(cache_dir: Union[str, Path], key: str) -> Optional[Any]:
+    """Load the cached object for ``key``. Returns ``None`` if nothing is cached yet."""
+    cache_file = _cache_file(cache_dir, key)
+    if not cache_file.exists():
+        return None
+    return pd.read_pickle(cache_file)
+
+
+def save(cache_dir: Union[str, Path], key: str, obj: Any) -> None:
+    """Store ``obj`` for ``key`` in ``cache_dir``."""
+    os.makedirs(cache_dir, exist_ok=True)
+    # write to a temporary file first, so that concurrent runs never read a partially written file
+    fd, temp_file = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    os.close(fd)
+    try:
+        pd.to_pickle(obj, temp_file)
+        os.replace(temp_file, _cache_file(cache_dir, key))
+    finally:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
@@ -0,0 +1,201 @@
+import calendar
+import copy
+from typing import TYPE_CHECKING, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from dp_mobility_report import DpMobilityReport
+
+from dp_mobility_report import constants as const
+from dp_mobility_report.model.m_utils import locked_cached_property
+from dp_mobility_report.model import od_analysis, place_analysis, preprocessing, user_analysis
+
+
+class TrueAggregates:
+    """Exact (noise-free) aggregates of the processed mobility data of a report, i.e., the sufficient statistics of all analyses.
+    Each aggregate is computed lazily on first access and then reused, so that further releases of the report with different privacy settings (see ``release()``) only need to draw new noise.
+
+    Args:
+        dpmreport: ``DpMobilityReport`` with the processed data and the settings of the analyses.
+    """
+
+    def __init__(self, dpmreport: "DpMobilityReport") -> None:
+        self._dpmreport = dpmreport
+        self._df = dpmreport.df
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """The processed data the aggregates are computed from."""
+        return self._df
+
+    def release(
+        self,
+        privacy_budget: Optional[Union[int, float]],
+        delta: Optional[float] = None,
+        gaussian: bool = False,
+        seed: Optional[int] = None,
+    ) -> dict:
+        """Create the report elements with a new privacy setting from the cached aggregates.
+        All other settings (e.g., the analysis selection and the budget split) are the same as for the original report.
+
+        Args:
+            privacy_budget: privacy_budget for the differentially private report. ``None`` for no privacy guarantee.
+            delta: The probability of failing to achieve epsilon-dp. Only needed if Gaussian Mechanism is chosen. Defaults to ``None``.
+            gaussian: Whether the Gaussian Mechanism should be applied instead of LaPlace. Defaults to ``False``.
+            seed: Seed for the noise, see argument ``seed_noise`` of ``DpMobilityReport``. Defaults to ``None``, i.e., no seed.
+
+        Returns:
+            A dictionary with all report elements, see ``DpMobilityReport.report``.
+        """
+        from dp_mobility_report.report import report
+
+        preprocessing.validate_release_input(privacy_budget, gaussian, delta, seed)
+        dpmreport = copy.copy(self._dpmreport)
+        dpmreport._privacy_budget = (
+            None if privacy_budget is None else float(privacy_budget)
+        )
+        dpmreport.delta = delta
+        dpmreport.gaussian = gaussian
+        dpmreport.seed_noise = seed
+        dpmreport._report = {}
+        return report.report_elements(dpmreport)
+
+    @locked_cached_property
+    def dataset_statistics(self) -> dict:
+        """Number of incomplete trips (single record), complete trips, users and distinct locations."""
+        records_per_trip = self._df[const.TID].value_counts().value_counts()
+        return {
+            const.N_INCOMPLETE_TRIPS: records_per_trip.get(1, 0),
+            const.N_COMPLETE_TRIPS: records_per_trip.get(2, 0),
+            const.N_USERS: self._df[const.UID].nunique(),
+            const.N_LOCATIONS: self._df.groupby([const.LAT, const.LNG]).ngroups,
+        }
+
+    @locked_cached_property
+    def missing_values(self) -> dict:
+        """Number of missing values of each input column."""
+        columns = [const.UID, const.TID, const.DATETIME, const.LAT, const.LNG]
+        return dict((len(self._df) - self._df.count())[columns])
+
+    @locked_cached_property
+    def trip_ends(self) -> pd.Series:
+        """Timestamps of all trip ends (i.e., one per trip), sorted in ascending order. Missing timestamps are dropped."""
+        return (
+            self._df.loc[self._df[const.POINT_TYPE] == const.END, const.DATETIME]
+            .dropna()
+            .sort_values()
+            .reset_index(drop=True)
+        )
+
+    @locked_cached_property
+    def trips_per_weekday(self) -> pd.Series:
+        """Number of trips (ends) per day of the week, indexed by day name."""
+        trips_per_weekday = (
+            self.trip_ends.dt.day_name()
+            .value_counts()
+            .reindex(list(calendar.day_name), fill_value=0)
+        )
+        trips_per_weekday.index = pd.Categorical(
+            trips_per_weekday.index, list(calendar.day_name)
+        )
+        return trips_per_weekday
+
+    @locked_cached_property
+    def trips_per_hour(self) -> np.ndarray:
+        """Number of records for each hour x (weekday, weekend) x (end, start) as flattened cube of 24 * 2 * 2 cells."""
+        # records without hour are not counted
+        df = self._df[self._df[const.HOUR].notna()]
+        hour = df[const.HOUR].to_numpy(np.int64)
+        is_weekend = (df[const.IS_WEEKEND] == const.WEEKEND).to_numpy(int)
+        is_start = (df[const.POINT_TYPE] == const.START).to_numpy(int)
+        return np.bincount((hour * 2 + is_weekend) * 2 + is_start, minlength=24 * 2 * 2)
+
+    @locked_cached_property
+    def visits_per_tile(self) -> pd.DataFrame:
+        """Number of visits of each tile of the tessellation, sorted by visits."""
+        tessellation = self._dpmreport.tessellation
+        visits_per_tile = (
+            self._df[
+                self._df[const.TILE_ID].isin(tessellation.tile_id)
+            ]  # only include records within tessellation
+            .groupby(const.TILE_ID, observed=True)
+            .aggregate(visits=(const.TILE_ID, "count"))
+            .sort_values("visits", ascending=False)
+            .reset_index()
+        )
+        visits_per_tile = visits_per_tile.merge(
+            tessellation[[const.TILE_ID, const.TILE_NAME]],
+            on=const.TILE_ID,
+            how="outer",
+        ).sort_values("visits", ascending=False)
+        visits_per_tile.loc[visits_per_tile.visits.isna(), "visits"] = 0
+        return visits_per_tile
+
+    @property
+    def n_outside_tessellation(self) -> int:
+        """Number of records outside of the tessellation."""
+        return int(len(self._df) - self.visits_per_tile.visits.sum())
+
+    @locked_cached_property
+    def visits_per_time_tile(self) -> tuple:
+        """Number of visits (ends) for each (weekday / weekend, time window, tile) as cube, with the labels of its three axes.
+        Only weekday / weekend and time windows that are present in the data are included.
+        """
+        hour_to_window, window_labels = place_analysis._hour_bins(
+            self._dpmreport.timewindows
+        )
+        # records without hour are not counted
+        df = self._df[self._df[const.HOUR].notna()]
+        window_codes = hour_to_window[df[const.HOUR].to_numpy(np.int64)]
+        weekend_codes = (df[const.IS_WEEKEND] == const.WEEKEND).to_numpy(int)
+        tile_ids = pd.Index(
+            self._dpmreport.tessellation[const.TILE_ID].unique()
+        ).sort_values()
+        tile_codes = pd.Categorical(df[const.TILE_ID], categories=tile_ids).codes
+
+        # only points within tessellation and end points
+        is_counted = (df[const.POINT_TYPE] == const.END).to_numpy() & (
+            tile_codes >= 0
+        )
+        n_windows, n_tiles = len(window_labels), len(tile_ids)
+        counts = np.bincount(
+            (weekend_codes[is_counted] * n_windows + window_codes[is_counted])
+            * n_tiles
+            + tile_codes[is_counted],
+            minlength=2 * n_windows * n_tiles,
+        ).reshape(2, n_windows, n_tiles)
+
+        is_weekend = np.unique(weekend_codes)
+        timewindows = np.unique(window_codes)
+        return (
+            counts[np.ix_(is_weekend, timewindows)],
+            np.array([const.WEEKDAY, const.WEEKEND])[is_weekend],
+            window_labels[timewindows],
+            tile_ids,
+        )
+
+    @locked_cached_property
+    def od_shape(self) -> pd.DataFrame:
+        """Origin and destination of each trip, see ``od_analysis.get_od_shape()``."""
+        return od_analysis.get_od_shape(self._df)
+
+    @locked_cached_property
+    def user_time_delta(self) -> np.ndarray:
+        """Time (in hours) between consecutive trips of the same user, sorted in ascending order."""
+        return np.sort(user_analysis._user_time_delta(self._df).to_numpy())
+
+    @locked_cached_property
+    def radius_of_gyration(self) -> np.ndarray:
+        """Radius of gyration of each user, sorted in ascending order."""
+        return np.sort(
+            user_analysis._radius_of_gyration(self._dpmreport.user_aggregates).to_numpy()
+        )
+
+    @locked_cached_property
+    def mobility_entropy(self) -> np.ndarray:
+        """Mobility entropy of each user, sorted in ascending order."""
+        return np.sort(
+            user_analysis._mobility_entropy(self._dpmreport.user_aggregates)
+        )
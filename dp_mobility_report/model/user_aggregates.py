@@ -0,0 +1,102 @@
+
+import numpy as np
+import pandas as pd
+
+from dp_mobility_report import constants as const
+from dp_mobility_report.model.m_utils import locked_cached_property
+
+
+class UserAggregates:
+    """Per-user aggregates of the (preprocessed) mobility data, shared by all user analyses.
+    Users are identified by integer codes (position in ``users``, sorted by user ID).
+    Each aggregate is computed lazily on first access and then reused.
+
+    Args:
+        df: preprocessed ``DataFrame`` of the report.
+    """
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        self._df = df
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """The processed data the aggregates are computed from."""
+        return self._df
+
+    @locked_cached_property
+    def _factorized_users(self) -> tuple:
+        return pd.factorize(self._df[const.UID], sort=True)
+
+    @property
+    def user_codes(self) -> np.ndarray:
+        """Integer user code of each record."""
+        return self._factorized_users[0]
+
+    @property
+    def users(self) -> pd.Index:
+        """User IDs, indexed by user code."""
+        return self._factorized_users[1]
+
+    @property
+    def n_users(self) -> int:
+        return len(self.users)
+
+    @locked_cached_property
+    def n_records(self) -> np.ndarray:
+        """Number of records of each user."""
+        return np.bincount(self.user_codes, minlength=self.n_users)
+
+    @locked_cached_property
+    def trips_per_user(self) -> np.ndarray:
+        """Number of distinct trips of each user."""
+        # trip ids are unique across users (see preprocessing)
+        _, first_record_of_trip = np.unique(
+            self._df[const.TID].to_numpy(), return_index=True
+        )
+        return np.bincount(
+            self.user_codes[first_record_of_trip], minlength=self.n_users
+        )
+
+    @locked_cached_property
+    def _tile_visits(self) -> tuple:
+        # visit counts of each (user, tile) pair, sorted by user
+        # records without a tile (outside of the tessellation) are not counted
+        tile_codes, tiles = pd.factorize(self._df[const.TILE_ID])
+        inside = tile_codes >= 0
+        pairs, counts = np.unique(
+            self.user_codes[inside].astype(np.int64) * len(tiles) + tile_codes[inside],
+            return_counts=True,
+        )
+        return pairs // max(len(tiles), 1), counts
+
+    @property
+    def tile_visit_users(self) -> np.ndarray:
+        """User code of each (user, tile) pair."""
+        return self._tile_visits[0]
+
+    @property
+    def tile_visit_counts(self) -> np.ndarray:
+        """Number of visits of each (user, tile) pair."""
+        return self._tile_visits[1]
+
+    @locked_cached_property
+    def user_tile_count(self) -> np.ndarray:
+        """Number of distinct tiles visited by each user."""
+        return np.bincount(self.tile_visit_users, minlength=self.n_users)
+
+    @locked_cached_property
+    def center_of_mass(self) -> tuple:
+        """Mean latitude and longitude of each user."""
+        return tuple(
+            np.bincount(self.user_codes, weights=coords) / self.n_records
+            for coords in self.coordinates
+        )
+
+    @locked_cached_property
+    def coordinates(self) -> tuple:
+        """Latitude and longitude of each record (aligned with ``user_codes``)."""
+        return (
+            self._df[const.LAT].to_numpy(dtype=np.float64),
+            self._df[const.LNG].to_numpy(dtype=np.float64),
+        )
+
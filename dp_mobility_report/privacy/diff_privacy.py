@@ -1,38 +1,48 @@
-from typing import Optional, Tuple, Type, Union
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional, Tuple, Type, Union
 
 import diffprivlib
 import numpy as np
 import pandas as pd
 import math
-from diffprivlib.validation import clip_to_bounds
+from functools import lru_cache
 from scipy.stats import laplace
 from scipy.stats import norm
 
 def bounds_dp(
-    array: Union[np.ndarray, pd.Series], eps: Optional[float], sensitivity: int
+    array: Union[np.ndarray, pd.Series],
+    eps: Optional[float],
+    sensitivity: int,
+    rng: Optional[np.random.Generator] = None,
 ) -> Tuple:
-    if eps is None:
-        return (array.min(), array.max())
-    epsi = eps / 2
-    result = [1, 0]
+    """``sorted_bounds_dp`` of an unsorted array. Missing values of a ``pd.Series`` are ignored."""
     if isinstance(array, np.ndarray):
         array = np.sort(array)
-
     else:
-        array = array.sort_values().reset_index(drop=True)
-    k = array.size
+        array = array.dropna().sort_values().reset_index(drop=True)
+    return sorted_bounds_dp(array, eps, sensitivity, rng)
+
+
+def sorted_bounds_dp(
+    sorted_array: Union[np.ndarray, pd.Series],
+    eps: Optional[float],
+    sensitivity: int,
+    rng: Optional[np.random.Generator] = None,
+) -> Tuple:
+    """``bounds_dp`` of an array that is already sorted in ascending order."""
+    k = sorted_array.size
+    if eps is None:
+        return (sorted_array[0], sorted_array[k - 1])
+    epsi = eps / 2
+    result = [1, 0]
 
     # min can potentially be larger than max
     # if so, retry until a result is found where min < max
     while result[1] < result[0]:
         for quant in [0, 1]:
-            mech = diffprivlib.mechanisms.exponential.Exponential(
-                epsilon=epsi,
-                sensitivity=sensitivity,
-                utility=list(-np.abs(np.arange(0, k) - quant * k)),
-            )
-            idx = mech.randomise()
-            output = array[idx]
+            idx = exponential_mechanism_index(k, quant, epsi, sensitivity, rng)
+            output = sorted_array[idx]
             result[quant] = output
     return (result[0], result[1])
 
@@ -43,105 +53,269 @@ def quartiles_dp(
     sensitivity: int,
     bounds: Tuple = None,
     conf_interval_perc: float = 0.95,
+    rng: Optional[np.random.Generator] = None,
 ) -> Tuple:
-
+    """``sorted_quartiles_dp`` of an unsorted ``pd.Series``, which may also hold datetimes or timedeltas. Missing values are ignored."""
     # remove nans from array
     array = array.dropna()
 
     if np.issubdtype(array.dtype, np.timedelta64):
-        array = array.values.astype(np.int64)
         dtyp = "timedelta"
     elif np.issubdtype(array.dtype, np.datetime64):
-        array = array.values.astype(np.int64)
         dtyp = "datetime"
     else:
         dtyp = "0"
+    array = np.ravel(array.values)
+    if dtyp != "0":
+        array = array.astype(np.int64)
+
+    quartiles, counter = sorted_quartiles_dp(
+        np.sort(array), eps, sensitivity, bounds, conf_interval_perc, rng
+    )
+
+    if dtyp == "timedelta":
+        quartiles = pd.to_timedelta(quartiles)
+    elif dtyp == "datetime":
+        quartiles = pd.to_datetime(quartiles)
+    return (quartiles, counter)
+
 
+def sorted_quartiles_dp(
+    sorted_array: np.ndarray,
+    eps: Optional[float],
+    sensitivity: int,
+    bounds: Tuple = None,
+    conf_interval_perc: float = 0.95,
+    rng: Optional[np.random.Generator] = None,
+) -> Tuple:
+    """``quartiles_dp`` of a numeric array without nans that is already sorted in ascending order."""
     if bounds is None:
         epsi = eps / 5 if eps is not None else None
         bound_epsi = 2 * epsi if epsi is not None else None
-        bounds = bounds_dp(array, bound_epsi, sensitivity)
+        bounds = sorted_bounds_dp(sorted_array, bound_epsi, sensitivity, rng)
     else:
         epsi = eps / 3 if eps is not None else None
 
-    result = []
-    result.append(bounds[0])
+    # values are clipped to the bounds: as clipping is monotonic, the clipped array is still sorted
+    # and only the selected values need to be clipped
+    def clipped(idx: int) -> Union[int, float]:
+        return min(max(sorted_array[idx], bounds[0]), bounds[1])
+
+    k = sorted_array.size
+    result = [bounds[0]]
+    for quant in [0.25, 0.5, 0.75]:
+        if eps is None:
+            # linear interpolation (as pd.Series.quantile)
+            position = quant * (k - 1)
+            lower = math.floor(position)
+            upper = min(lower + 1, k - 1)
+            result.append(
+                clipped(lower) + (clipped(upper) - clipped(lower)) * (position - lower)
+            )
+        else:
+            idx = exponential_mechanism_index(k, quant, epsi, sensitivity, rng)
+            result.append(clipped(idx))
+    result.append(bounds[1])
 
-    array_type = array.dtype
-    array = pd.Series(clip_to_bounds(np.ravel(array), bounds))
-    array = array.sort_values().reset_index(drop=True)
-    array = array.astype(
-        array_type
-    )  # clip_to_bounds converts int arrays to float arrays > convert those back to int
+    # get margin of error
+    counter = (
+        0
+        if eps is None
+        else exponential_mechanism_margin(k, 0.5, eps, sensitivity, conf_interval_perc)
+    )
 
-    k = array.size
+    return (pd.Series(result, index=["min", "25%", "50%", "75%", "max"]), counter)
 
-    def utility(quant: float, k: int) -> list:
-        return list(-np.abs(np.arange(0, k) - quant * k))
 
-    if eps is None:
-        result.append(array.quantile(0.25))
-        result.append(array.quantile(0.5))
-        result.append(array.quantile(0.75))
-    else:
-        for quant in [0.25, 0.5, 0.75]:
-            mech = diffprivlib.mechanisms.exponential.Exponential(
-                epsilon=epsi,
-                sensitivity=sensitivity,
-                utility=utility(quant, k),
-            )
-            idx = mech.randomise()
-            output = array[idx]
-            result.append(output)
+# default generator, if no (seeded) generator is passed to the noise functions
+_rng = np.random.default_rng()
+# generator of the current context (e.g., of a single report element), see `rng_context`
+_context_rng: ContextVar[Optional[np.random.Generator]] = ContextVar(
+    "rng", default=None
+)
 
-    result.append(bounds[1])
 
-    if dtyp == "timedelta":
-        result = pd.to_timedelta(result)
-    elif dtyp == "datetime":
-        result = pd.to_datetime(result)
+def _get_rng(rng: Optional[np.random.Generator]) -> np.random.Generator:
+    if rng is not None:
+        return rng
+    context_rng = _context_rng.get()
+    return _rng if context_rng is None else context_rng
 
-    # get margin of error
 
-    # Calculate the probability for each element, based on its score
-    counter = 0
-    if eps is not None:
-        probabilities = [np.exp(eps * u / (2 * sensitivity)) for u in utility(0.5, k)]
-        # Normalize the probabilties so they sum to 1
-        probabilities = probabilities / np.linalg.norm(probabilities, ord=1)
-
-        max_index = np.argmax(probabilities)
-        conf = probabilities[max_index]
-        while conf < conf_interval_perc:
-            counter += 1
-            if max_index + counter < len(probabilities):
-                conf += probabilities[max_index + counter]
-            if max_index - counter >= 0:
-                conf += probabilities[max_index - counter]
+@contextmanager
+def rng_context(rng: np.random.Generator) -> Iterator[np.random.Generator]:
+    """Use ``rng`` for all noise that is drawn within the context (in the current thread), if no generator is passed explicitly."""
+    token = _context_rng.set(rng)
+    try:
+        yield rng
+    finally:
+        _context_rng.reset(token)
 
-    return (pd.Series(result, index=["min", "25%", "50%", "75%", "max"]), counter)
+
+def laplace_scale(eps: float, sensitivity: Union[int, float]) -> float:
+    return sensitivity / eps
+
+
+@lru_cache(maxsize=128)
+def gaussian_scale(eps: float, delta: float, sensitivity: Union[int, float]) -> float:
+    # analytic calibration (Balle and Wang, 2018) is a binary search: compute it once per parameter set
+    # instead of once per cell. Sensitivity is the L2 sensitivity, i.e., sqrt of the count sensitivity.
+    return diffprivlib.mechanisms.GaussianAnalytic(
+        epsilon=eps, delta=delta, sensitivity=math.sqrt(sensitivity)
+    )._scale
+
+
+def noise(
+    size: Union[int, Tuple[int, ...], None],
+    eps: float,
+    delta: Optional[float],
+    sensitivity: Union[int, float],
+    gaussian: bool,
+    rng: Optional[np.random.Generator] = None,
+) -> Union[float, np.ndarray]:
+    rng = _get_rng(rng)
+    if gaussian:
+        return rng.normal(0, gaussian_scale(eps, delta, sensitivity), size)
+    return rng.laplace(0, laplace_scale(eps, sensitivity), size)
 
 
-def _laplacer(x: int, eps: float, sensitivity: int) -> int:
-    return int(
-        round(
-            diffprivlib.mechanisms.laplace.Laplace(
-                epsilon=eps, delta=0.0, sensitivity=sensitivity
-            ).randomise(x),
-            0,
-        )
+def noise_tail_probability(
+    threshold: float,
+    eps: float,
+    delta: Optional[float],
+    sensitivity: Union[int, float],
+    gaussian: bool,
+) -> float:
+    """Probability that a single noise draw exceeds ``threshold`` (``threshold`` >= 0)."""
+    if gaussian:
+        return norm.sf(threshold, scale=gaussian_scale(eps, delta, sensitivity))
+    return laplace.sf(threshold, scale=laplace_scale(eps, sensitivity))
+
+
+def noise_tail(
+    size: int,
+    threshold: float,
+    eps: float,
+    delta: Optional[float],
+    sensitivity: Union[int, float],
+    gaussian: bool,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """Draw noise conditioned on being greater than ``threshold`` (``threshold`` >= 0)."""
+    rng = _get_rng(rng)
+    if gaussian:
+        scale = gaussian_scale(eps, delta, sensitivity)
+        # inverse transform sampling within the upper tail
+        u = 1 - rng.random(size)  # in (0, 1]
+        return norm.isf(u * norm.sf(threshold, scale=scale), scale=scale)
+    # the laplace distribution is memoryless beyond 0: its tail is a shifted exponential distribution
+    return threshold + rng.exponential(laplace_scale(eps, sensitivity), size)
+
+
+def zero_counts_dp(
+    n_zeros: int,
+    eps: float,
+    delta: Optional[float],
+    sensitivity: int,
+    gaussian: bool,
+    rng: Optional[np.random.Generator] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Apply noise to ``n_zeros`` counts of 0 without materializing them.
+    Only the counts that become positive after noise and rounding are sampled:
+    their number is drawn from a binomial distribution with the tail probability of the noise,
+    their positions uniformly among all zero counts and their values from the noise tail.
+    The result is equal in distribution to ``counts_dp(np.zeros(n_zeros), ...)`` restricted to positive counts.
+
+    Returns:
+        Positions (indices within ``range(n_zeros)``) and noisy values of the positive counts.
+    """
+    rng = _get_rng(rng)
+    # a noisy zero is rounded to a positive integer if noise > 0.5
+    p_positive = noise_tail_probability(0.5, eps, delta, sensitivity, gaussian)
+    n_positive = rng.binomial(n_zeros, p_positive) if n_zeros > 0 else 0
+    positions = np.sort(rng.choice(n_zeros, size=n_positive, replace=False, shuffle=False))
+    values = np.rint(
+        noise_tail(n_positive, 0.5, eps, delta, sensitivity, gaussian, rng)
+    ).astype(np.int64)
+    return positions, values
+
+
+# The exponential mechanism for quantiles selects index i of the sorted array (of size k)
+# with probability proportional to exp(a * utility) with utility = -|i - quant * k| and a = eps / (2 * sensitivity).
+# These probabilities are a two-sided geometric distribution around quant * k,
+# so that indices and margins of error are computed in closed form instead of with a probability per index.
+def _exponential_mechanism_sides(
+    k: int, quant: float, eps: float, sensitivity: Union[int, float]
+) -> Tuple[float, int, int, float, float]:
+    a = eps / (2 * sensitivity)
+    center = quant * k
+    mode = min(math.floor(center), k - 1)  # highest utility (the lower one in case of a tie)
+    # weights of the mode and the index above the mode
+    weight_mode = math.exp(-a * (center - mode))
+    weight_above = math.exp(-a * (mode + 1 - center))
+    return a, mode, k - 1 - mode, weight_mode, weight_above
+
+
+def _geometric_sum(a: float, n: int) -> float:
+    # sum of exp(-a * j) for j in range(n)
+    return math.expm1(-a * n) / math.expm1(-a) if n > 0 else 0.0
+
+
+def exponential_mechanism_index(
+    k: int,
+    quant: float,
+    eps: float,
+    sensitivity: Union[int, float],
+    rng: Optional[np.random.Generator] = None,
+) -> int:
+    """Index of the ``quant`` quantile of a sorted array of size ``k`` selected with the exponential mechanism."""
+    rng = _get_rng(rng)
+    a, mode, n_above, weight_mode, weight_above = _exponential_mechanism_sides(
+        k, quant, eps, sensitivity
+    )
+    mass_below = weight_mode * _geometric_sum(a, mode + 1)  # mode and below
+    mass_above = weight_above * _geometric_sum(a, n_above)
+    below, n = (
+        (True, mode + 1)
+        if rng.random() * (mass_below + mass_above) < mass_below
+        else (False, n_above)
     )
-def _gaussianer(x: int, eps: float, delta: float, sensitivity: int) -> int:
-    sensitivity = math.sqrt(sensitivity)
-    return int(
-        round(
-            diffprivlib.mechanisms.GaussianAnalytic(
-                epsilon=eps, delta=delta, sensitivity=sensitivity
-            ).randomise(x),
-            0,
-        )
+    # inverse transform sampling of the distance j in range(n) with probability proportional to exp(-a * j)
+    j = math.floor(math.log1p(rng.random() * math.expm1(-a * n)) / -a)
+    j = min(j, n - 1)
+    return mode - j if below else mode + 1 + j
+
+
+def exponential_mechanism_margin(
+    k: int,
+    quant: float,
+    eps: float,
+    sensitivity: Union[int, float],
+    conf_interval_perc: float,
+) -> int:
+    """Smallest distance (in indices) around the mode of the exponential mechanism
+    that covers at least ``conf_interval_perc`` of its probability mass."""
+    a, mode, n_above, weight_mode, weight_above = _exponential_mechanism_sides(
+        k, quant, eps, sensitivity
     )
 
+    def mass(distance: int) -> float:
+        return weight_mode * _geometric_sum(
+            a, min(distance, mode) + 1
+        ) + weight_above * _geometric_sum(a, min(distance, n_above))
+
+    total = mass(k)
+    # the covered mass increases with the distance: binary search
+    low, high = 0, k
+    while low < high:
+        middle = (low + high) // 2
+        if mass(middle) / total >= conf_interval_perc:
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+
 def laplace_margin_of_error(
     conf_interval_perc: float, eps: Optional[float], sensitivity: int
 ) -> float:
@@ -189,15 +363,12 @@ def count_dp(
     gaussian: bool,
     delta: Optional[float],
     nonzero: bool = False,
+    rng: Optional[np.random.Generator] = None,
 ) -> Optional[int]:
     if eps is None:
         return count
-    if gaussian:
-        dpcount = _gaussianer(count, eps, delta, sensitivity)
-        dpcount = int((abs(dpcount) + dpcount) / 2)  ## falls dpcount negativ wird er null
-    else:
-        dpcount = _laplacer(count, eps, sensitivity)  ## laplacenoise auf unsere zahl
-        dpcount = int((abs(dpcount) + dpcount) / 2)  ## falls dpcount negativ wird er null
+    dpcount = int(round(count + noise(None, eps, delta, sensitivity, gaussian, rng)))
+    dpcount = limit_negative_value_to_zero(dpcount)
     if nonzero:
         return dpcount if dpcount > 0 else None
     else:
@@ -211,23 +382,15 @@ def counts_dp(
     sensitivity: int,
     gaussian: bool,
     allow_negative: bool = False,
-
+    rng: Optional[np.random.Generator] = None,
 ) -> np.ndarray:
     if eps is None:
         return counts
-    eps_local = eps  # workaround for linting error
-
-    def _local_laplacer(x: int) -> int:
-        return _laplacer(x, eps_local, sensitivity)
-
-    def _local_gaussianer(x: int) -> int:
-        return _gaussianer(x, eps_local, delta, sensitivity)
-
-    if gaussian:
-        vfunc = np.vectorize(_local_gaussianer)
-    else:
-        vfunc = np.vectorize(_local_laplacer)
-    dpcounts = vfunc(counts)
+    counts = np.asarray(counts)
+    # draw noise for all cells at once instead of one mechanism per cell
+    dpcounts = np.rint(
+        counts + noise(counts.shape, eps, delta, sensitivity, gaussian, rng)
+    ).astype(np.int64)
     dpcounts = (
         limit_negative_values_to_zero(dpcounts) if not allow_negative else dpcounts
     )
@@ -235,8 +398,7 @@ def counts_dp(
 
 
 def limit_negative_values_to_zero(array: np.array) -> np.array:
-    x = np.vectorize(limit_negative_value_to_zero)
-    return x(array)
+    return np.maximum(array, 0)
 
 
 def limit_negative_value_to_zero(value: int) -> int:
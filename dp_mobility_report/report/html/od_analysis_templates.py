@@ -251,6 +251,7 @@ def render_origin_destination_flows(
         const.FLOW,
         "intra-tile flows",
         cmap=const.BASE_CMAP,
+        geojson_asset=const.TESSELLATION_ASSET,
     )  # get innerflows as color for choropleth
 
     # create od flows map
@@ -329,6 +330,7 @@ def render_benchmark_origin_destination_flows(
         is_cmap_diverging=True,
         min_scale=-2,
         max_scale=2,
+        geojson_asset=const.TESSELLATION_ASSET,
     )  # get innerflows as color for choropleth
 
     flows_base = data_base[
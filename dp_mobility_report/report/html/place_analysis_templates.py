@@ -1,6 +1,8 @@
 import os
+from concurrent.futures import Executor, Future
+from functools import partial
 from pathlib import Path
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Tuple
 
 import matplotlib.pyplot as plt
 import pandas as pd
@@ -29,6 +31,7 @@ def render_place_analysis(
     dpmreport: "DpMobilityReport",
     temp_map_folder: Path,
     output_filename: str,
+    executor: Optional[Executor] = None,
 ) -> str:
     THRESHOLD = 0.2  # 20%
     args: dict = {}
@@ -73,7 +76,7 @@ def render_place_analysis(
         )
 
         args["visits_per_tile_time_map"] = render_visits_per_time_tile(
-            report[const.VISITS_PER_TIME_TILE], tessellation, THRESHOLD
+            report[const.VISITS_PER_TIME_TILE], tessellation, THRESHOLD, executor
         )
         args["visits_per_tile_time_info"] = "User configuration of timewindows: " + str(
             [
@@ -93,6 +96,7 @@ def render_benchmark_place_analysis(
     benchmark: "BenchmarkReport",
     temp_map_folder: Path,
     output_filename: str,
+    executor: Optional[Executor] = None,
 ) -> str:
     args: dict = {}
     report_base = benchmark.report_base.report
@@ -188,6 +192,7 @@ def render_benchmark_place_analysis(
             report_base[const.VISITS_PER_TIME_TILE],
             report_alternative[const.VISITS_PER_TIME_TILE],
             tessellation,
+            executor,
         )
         args["visits_per_tile_time_info"] = "User configuration of timewindows: " + str(
             [
@@ -242,6 +247,7 @@ def render_visits_per_tile(
         scale_title="number of visits",
         aliases=["Tile ID", "Tile Name", "number of visits"],
         cmap=const.BASE_CMAP,
+        geojson_asset=const.TESSELLATION_ASSET,
     )
 
     map.save(os.path.join(temp_map_folder, "visits_per_tile_map.html"))
@@ -305,6 +311,7 @@ def render_benchmark_visits_per_tile(
         min_scale=-2,
         max_scale=2,
         layer_name="Deviation",
+        geojson_asset=const.TESSELLATION_ASSET,
     )
     min_scale = min(
         counts_per_tile_gdf["relative_base"].min(),
@@ -327,6 +334,7 @@ def render_benchmark_visits_per_tile(
         min_scale=min_scale,
         max_scale=max_scale,
         cmap=const.BASE_CMAP,
+        geojson_asset=const.TESSELLATION_ASSET,
     )
     map, legend_alternative = plot.choropleth_map(
         counts_per_tile_gdf,
@@ -340,6 +348,7 @@ def render_benchmark_visits_per_tile(
         min_scale=min_scale,
         max_scale=max_scale,
         cmap=const.ALT_CMAP,
+        geojson_asset=const.TESSELLATION_ASSET,
     )
 
     folium.LayerControl(collapsed=False).add_to(map)
@@ -453,7 +462,10 @@ def render_most_freq_tiles_ranking_benchmark(
 
 
 def render_visits_per_time_tile(
-    counts_per_tile_timewindow: DfSection, tessellation: GeoDataFrame, threshold: float
+    counts_per_tile_timewindow: DfSection,
+    tessellation: GeoDataFrame,
+    threshold: float,
+    executor: Optional[Executor] = None,
 ) -> str:
     data = counts_per_tile_timewindow.data
     moe_perc_per_tile_timewindow = (
@@ -465,14 +477,23 @@ def render_visits_per_time_tile(
 
     data[moe_perc_per_tile_timewindow > threshold] = None
 
+    # all maps of weekday and weekend are rendered concurrently, if an executor is given
+    timewindow_segments = {
+        is_weekend: _create_timewindow_segment(
+            data.loc[:, is_weekend], tessellation, executor
+        )
+        for is_weekend in ["weekday", "weekend"]
+        if is_weekend in data.columns
+    }
+
     output_html = ""
     if "weekday" in data.columns:
         output_html += "<h4>Weekday</h4>"
-        output_html += _create_timewindow_segment(data.loc[:, "weekday"], tessellation)
+        output_html += _timewindow_segment_html(*timewindow_segments["weekday"])
 
     if "weekend" in data.columns:
         output_html += "<h4>Weekend</h4>"
-        output_html += _create_timewindow_segment(data.loc[:, "weekend"], tessellation)
+        output_html += _timewindow_segment_html(*timewindow_segments["weekend"])
     plt.close()
     return output_html
 
@@ -481,6 +502,7 @@ def render_visits_per_time_tile_benchmark(
     counts_per_tile_timewindow: DfSection,
     counts_per_tile_timewindow_alternative: DfSection,
     tessellation: GeoDataFrame,
+    executor: Optional[Executor] = None,
 ) -> str:
     data = counts_per_tile_timewindow.data
     data_alternative = counts_per_tile_timewindow_alternative.data
@@ -490,7 +512,7 @@ def render_visits_per_time_tile_benchmark(
     if data_alternative is None:
         return None
 
-    output_html = ""
+    timewindow_segments: dict = {}
     if "weekday" in data.columns:
         weekday_base = data.loc[:, "weekday"] / data.loc[:, "weekday"].sum().sum()
         weekday_alternative = (
@@ -511,8 +533,9 @@ def render_visits_per_time_tile_benchmark(
         deviation.set_index(weekday_base.index, inplace=True)
         deviation.columns = weekday_base.columns
 
-        output_html += "<h4>Weekday</h4>"
-        output_html += _create_timewindow_segment_benchmark(deviation, tessellation)
+        timewindow_segments["Weekday"] = _submit(
+            executor, _create_timewindow_segment_benchmark, deviation, tessellation
+        )
 
     if "weekend" in data.columns:
         weekend_base = data.loc[:, "weekend"] / data.loc[:, "weekend"].sum().sum()
@@ -533,29 +556,64 @@ def render_visits_per_time_tile_benchmark(
         deviation.index = weekend_base.index
         deviation.columns = weekend_base.columns
 
-        output_html += "<h4>Weekend</h4>"
-        output_html += _create_timewindow_segment_benchmark(deviation, tessellation)
+        timewindow_segments["Weekend"] = _submit(
+            executor, _create_timewindow_segment_benchmark, deviation, tessellation
+        )
+
+    output_html = ""
+    for title, timewindow_segment in timewindow_segments.items():
+        output_html += f"<h4>{title}</h4>"
+        output_html += timewindow_segment.result()
     plt.close()
     return output_html
 
 
-def _create_timewindow_segment(df: pd.DataFrame, tessellation: GeoDataFrame) -> str:
-    visits_choropleth = plot.multi_choropleth_map(df, tessellation)
+# render in a process of the executor, if given, else right away
+def _submit(
+    executor: Optional[Executor], render_function: Callable[..., str], *args: Any
+) -> Future:
+    if executor is not None:
+        return executor.submit(render_function, *args)
+    future: Future = Future()
+    future.set_result(render_function(*args))
+    return future
+
 
+def _create_timewindow_segment(
+    df: pd.DataFrame, tessellation: GeoDataFrame, executor: Optional[Executor] = None
+) -> Tuple[Future, Future]:
     tile_means = df.mean(axis=1)
     dev_from_avg = df.div(tile_means, axis=0)
-    deviation_choropleth = plot.multi_choropleth_map(
-        dev_from_avg, tessellation, is_cmap_diverging=True, min_scale=0, vcenter=1
+    visits_choropleth = _submit(executor, _render_multi_choropleth, df, tessellation)
+    deviation_choropleth = _submit(
+        executor,
+        partial(
+            _render_multi_choropleth, is_cmap_diverging=True, min_scale=0, vcenter=1
+        ),
+        dev_from_avg,
+        tessellation,
     )
-    html = f"""<h4>Number of visits</h4>
-        {v_utils.fig_to_html_as_png(visits_choropleth)}
+    return visits_choropleth, deviation_choropleth
+
+
+def _timewindow_segment_html(
+    visits_choropleth: Future, deviation_choropleth: Future
+) -> str:
+    return f"""<h4>Number of visits</h4>
+        {visits_choropleth.result()}
         <h4>Deviation from tile average</h4>
         <div><p>The average of each tile 
         over all time windows equals 1 (100% of average traffic). 
         A value of < 1 (> 1) means that a tile is visited less (more) frequently in this time window than it is on average.</p></div>
-        {v_utils.fig_to_html_as_png(deviation_choropleth)}"""  # svg might get too large
-    plt.close(visits_choropleth)
-    plt.close(deviation_choropleth)
+        {deviation_choropleth.result()}"""
+
+
+def _render_multi_choropleth(
+    df: pd.DataFrame, tessellation: GeoDataFrame, **kwargs: Any
+) -> str:
+    choropleth = plot.multi_choropleth_map(df, tessellation, **kwargs)
+    html = v_utils.fig_to_html_as_png(choropleth)  # svg might get too large
+    plt.close(choropleth)
     return html
 
 
@@ -1,6 +1,8 @@
+import copy
 import os
 import shutil
 import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from typing import TYPE_CHECKING, Tuple
 
@@ -19,6 +21,7 @@ from dp_mobility_report.report.html import (
     place_analysis_templates,
     user_analysis_templates,
 )
+from dp_mobility_report.visualization import plot
 
 
 def render_html(
@@ -26,6 +29,8 @@ def render_html(
     output_filename: str,
     top_n_flows: int = 100,
     disable_progress_bar: bool = False,
+    n_jobs: int = 1,
+    map_simplify_tolerance: float = const.MAP_SIMPLIFY_TOLERANCE,
 ) -> Tuple[str, Path]:
     template_structure = html_utils.get_template("structure.html")
     temp_map_folder = Path(os.path.join(tempfile.gettempdir(), "maps"))
@@ -36,42 +41,54 @@ def render_html(
 
     args: dict = {}
 
+    # tile geometries that are shared by all maps
+    if dpmreport.tessellation is not None:
+        plot.write_tessellation_asset(
+            dpmreport.tessellation, temp_map_folder, map_simplify_tolerance
+        )
+
     args["title"] = "DP Mobility Report"
     args["subtitle"] = dpmreport.subtitle
     args["output_filename"] = output_filename
 
-    with tqdm(  # progress bar
-        total=4, desc="Create HTML Output", disable=disable_progress_bar
-    ) as pbar:
+    args["config_segment"] = config_templates.render_config(dpmreport)
 
-        args["config_segment"] = config_templates.render_config(dpmreport)
+    if dpmreport.privacy_budget is not None:
+        args["dp_info"] = config_templates.render_dp_info()
 
-        if dpmreport.privacy_budget is not None:
-            args["dp_info"] = config_templates.render_dp_info()
+    # segments are rendered without the data (only the report is needed)
+    segment_report = _without_data(dpmreport)
+    segments: dict = {}
+    if not set(const.OVERVIEW_ELEMENTS).issubset(dpmreport.analysis_exclusion):
+        segments["overview_segment"] = (
+            overview_templates.render_overview,
+            segment_report,
+        )
 
-        if not set(const.OVERVIEW_ELEMENTS).issubset(dpmreport.analysis_exclusion):
-            args["overview_segment"] = overview_templates.render_overview(dpmreport)
-        pbar.update()
+    if not set(const.PLACE_ELEMENTS).issubset(dpmreport.analysis_exclusion):
+        segments["place_analysis_segment"] = (
+            place_analysis_templates.render_place_analysis,
+            segment_report,
+            temp_map_folder,
+            output_filename,
+        )
 
-        if not set(const.PLACE_ELEMENTS).issubset(dpmreport.analysis_exclusion):
-            args[
-                "place_analysis_segment"
-            ] = place_analysis_templates.render_place_analysis(
-                dpmreport, temp_map_folder, output_filename
-            )
-        pbar.update()
+    if not set(const.OD_ELEMENTS).issubset(dpmreport.analysis_exclusion):
+        segments["od_analysis_segment"] = (
+            od_analysis_templates.render_od_analysis,
+            segment_report,
+            top_n_flows,
+            temp_map_folder,
+            output_filename,
+        )
 
-        if not set(const.OD_ELEMENTS).issubset(dpmreport.analysis_exclusion):
-            args["od_analysis_segment"] = od_analysis_templates.render_od_analysis(
-                dpmreport, top_n_flows, temp_map_folder, output_filename
-            )
-        pbar.update()
+    if not set(const.USER_ELEMENTS).issubset(dpmreport.analysis_exclusion):
+        segments["user_analysis_segment"] = (
+            user_analysis_templates.render_user_analysis,
+            segment_report,
+        )
 
-        if not set(const.USER_ELEMENTS).issubset(dpmreport.analysis_exclusion):
-            args[
-                "user_analysis_segment"
-            ] = user_analysis_templates.render_user_analysis(dpmreport)
-        pbar.update()
+    args.update(_render_segments(segments, n_jobs, disable_progress_bar))
 
     return (
         template_structure.render(args),
@@ -84,6 +101,8 @@ def render_benchmark_html(
     output_filename: str,
     top_n_flows: int = 100,
     disable_progress_bar: bool = False,
+    n_jobs: int = 1,
+    map_simplify_tolerance: float = const.MAP_SIMPLIFY_TOLERANCE,
 ) -> Tuple[str, Path]:
     template_structure = html_utils.get_template("structure.html")
     temp_map_folder = Path(os.path.join(tempfile.gettempdir(), "maps"))
@@ -94,49 +113,59 @@ def render_benchmark_html(
 
     args: dict = {}
 
+    # tile geometries that are shared by all maps
+    if benchmarkreport.report_base.tessellation is not None:
+        plot.write_tessellation_asset(
+            benchmarkreport.report_base.tessellation,
+            temp_map_folder,
+            map_simplify_tolerance,
+        )
+
     args["title"] = "DP Mobility Report: Benchmark"
     args["subtitle"] = benchmarkreport.report_base.subtitle
     args["output_filename"] = output_filename
 
-    with tqdm(  # progress bar
-        total=4, desc="Create HTML Output", disable=disable_progress_bar
-    ) as pbar:
+    args["config_segment"] = config_templates.render_benchmark_config(benchmarkreport)
+    args["similarity_info"] = config_templates.render_similarity_info()
+    args["dp_info"] = config_templates.render_dp_info()
+
+    # segments are rendered without the data (only the reports are needed)
+    segment_report = copy.copy(benchmarkreport)
+    segment_report._report_base = _without_data(benchmarkreport.report_base)
+    segment_report._report_alternative = _without_data(
+        benchmarkreport.report_alternative
+    )
+    segments: dict = {}
+    if not set(const.OVERVIEW_ELEMENTS).issubset(benchmarkreport.analysis_exclusion):
+        segments["overview_segment"] = (
+            overview_templates.render_benchmark_overview,
+            segment_report,
+        )
 
-        args["config_segment"] = config_templates.render_benchmark_config(
-            benchmarkreport
+    if not set(const.PLACE_ELEMENTS).issubset(benchmarkreport.analysis_exclusion):
+        segments["place_analysis_segment"] = (
+            place_analysis_templates.render_benchmark_place_analysis,
+            segment_report,
+            temp_map_folder,
+            output_filename,
+        )
+
+    if not set(const.OD_ELEMENTS).issubset(benchmarkreport.analysis_exclusion):
+        segments["od_analysis_segment"] = (
+            od_analysis_templates.render_benchmark_od_analysis,
+            segment_report,
+            top_n_flows,
+            temp_map_folder,
+            output_filename,
+        )
+
+    if not set(const.USER_ELEMENTS).issubset(benchmarkreport.analysis_exclusion):
+        segments["user_analysis_segment"] = (
+            user_analysis_templates.render_benchmark_user_analysis,
+            segment_report,
         )
-        args["similarity_info"] = config_templates.render_similarity_info()
-        args["dp_info"] = config_templates.render_dp_info()
 
-        if not set(const.OVERVIEW_ELEMENTS).issubset(
-            benchmarkreport.analysis_exclusion
-        ):
-            args["overview_segment"] = overview_templates.render_benchmark_overview(
-                benchmarkreport
-            )
-        pbar.update()
-
-        if not set(const.PLACE_ELEMENTS).issubset(benchmarkreport.analysis_exclusion):
-            args[
-                "place_analysis_segment"
-            ] = place_analysis_templates.render_benchmark_place_analysis(
-                benchmarkreport, temp_map_folder, output_filename
-            )
-        pbar.update()
-
-        if not set(const.OD_ELEMENTS).issubset(benchmarkreport.analysis_exclusion):
-            args[
-                "od_analysis_segment"
-            ] = od_analysis_templates.render_benchmark_od_analysis(
-                benchmarkreport, top_n_flows, temp_map_folder, output_filename
-            )
-        pbar.update()
-
-        if not set(const.USER_ELEMENTS).issubset(benchmarkreport.analysis_exclusion):
-            args[
-                "user_analysis_segment"
-            ] = user_analysis_templates.render_benchmark_user_analysis(benchmarkreport)
-        pbar.update()
+    args.update(_render_segments(segments, n_jobs, disable_progress_bar))
 
     return (
         template_structure.render(args),
@@ -144,6 +173,55 @@ def render_benchmark_html(
     )
 
 
+# segments that hand their most expensive figures to the process pool (via argument ``executor``)
+_FIGURE_SEGMENTS = ["place_analysis_segment"]
+
+
+# render each segment, given as (render function, *arguments), in a separate process if n_jobs > 1.
+# Maps are written to the (shared) temp map folder by the workers.
+def _render_segments(segments: dict, n_jobs: int, disable_progress_bar: bool) -> dict:
+    if not isinstance(n_jobs, int):
+        raise TypeError("'n_jobs' is not an integer.")
+    if (n_jobs <= 0) and (n_jobs != -1):
+        raise ValueError("'n_jobs' has to be greater 0 or -1 (all cores).")
+    n_jobs = os.cpu_count() if n_jobs == -1 else n_jobs
+
+    rendered_segments: dict = {}
+    with tqdm(  # progress bar
+        total=len(segments), desc="Create HTML Output", disable=disable_progress_bar
+    ) as pbar:
+        if n_jobs == 1:
+            for segment, (render_function, *args) in segments.items():
+                rendered_segments[segment] = render_function(*args)
+                pbar.update()
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                futures = {
+                    executor.submit(render_function, *args): segment
+                    for segment, (render_function, *args) in segments.items()
+                    if segment not in _FIGURE_SEGMENTS
+                }
+                for segment, (render_function, *args) in segments.items():
+                    if segment in _FIGURE_SEGMENTS:
+                        rendered_segments[segment] = render_function(
+                            *args, executor=executor
+                        )
+                        pbar.update()
+                for future in as_completed(futures):
+                    rendered_segments[futures[future]] = future.result()
+                    pbar.update()
+    return rendered_segments
+
+
+# shallow copy of a report without the (processed) data, so that it can be sent to other processes cheaply
+def _without_data(dpmreport: "DpMobilityReport") -> "DpMobilityReport":
+    report_copy = copy.copy(dpmreport)
+    report_copy._df = dpmreport.df.iloc[:0]
+    report_copy._user_aggregates = None
+    report_copy._true_aggregates = None
+    return report_copy
+
+
 def create_html_assets(output_file: Path) -> None:
     path = Path(os.path.join(output_file, "assets"))
     if path.is_dir():
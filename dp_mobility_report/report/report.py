@@ -1,7 +1,9 @@
 import math
-from typing import TYPE_CHECKING
+import os
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Callable, Dict, Optional
 
-from pandas import DataFrame
+import numpy as np
 from tqdm.auto import tqdm
 
 if TYPE_CHECKING:
@@ -14,6 +16,8 @@ from dp_mobility_report.model import (
     place_analysis,
     user_analysis,
 )
+from dp_mobility_report.model.section import Section
+from dp_mobility_report.privacy import diff_privacy
 
 
 def report_elements(dpmreport: "DpMobilityReport") -> dict:
@@ -49,31 +53,61 @@ def report_elements(dpmreport: "DpMobilityReport") -> dict:
             else dpmreport.privacy_budget
         )
 
-    with tqdm(  # progress bar
-        total=4, desc="Create report", disable=dpmreport.disable_progress_bar
-    ) as pbar:
+    elements = [
+        element
+        for element in const.ELEMENTS
+        if element not in dpmreport.analysis_exclusion
+    ]
 
-        report = {**report, **add_overview_elements(dpmreport, eps_factor, deltai)}
-        pbar.update()
+    # one seed per element (of all elements, independent of the selection):
+    # the noise of an element does not depend on the order in which the elements are computed
+    seeds = dict(
+        zip(
+            const.ELEMENTS,
+            np.random.SeedSequence(dpmreport.seed_noise).spawn(len(const.ELEMENTS)),
+        )
+    )
 
-        report = {
-            **report,
-            **add_place_analysis_elements(dpmreport, eps_factor, deltai),
-        }
-        pbar.update()
+    def compute_element(element: str, od_shape: Optional[Future] = None) -> Section:
+        args = [
+            dpmreport,
+            _get_eps(
+                eps_factor, element, dpmreport.budget_split, dpmreport.gaussian
+            ),
+            deltai,
+        ]
+        if element in const.OD_ELEMENTS:
+            # od elements depend on the shared od shape
+            args.insert(0, od_shape.result())
+        with diff_privacy.rng_context(np.random.default_rng(seeds[element])):
+            return _ELEMENT_FUNCTIONS[element](*args)
 
-        if not set(const.OD_ELEMENTS).issubset(dpmreport.analysis_exclusion):
-            _od_shape = od_analysis.get_od_shape(dpmreport.df)
-            report = {
-                **report,
-                **add_od_analysis_elements(dpmreport, _od_shape, eps_factor, deltai),
+    report: dict = {}
+    with tqdm(  # progress bar
+        total=len(elements), desc="Create report", disable=dpmreport.disable_progress_bar
+    ) as pbar:
+        n_jobs = os.cpu_count() if dpmreport.n_jobs == -1 else dpmreport.n_jobs
+        # the aggregates are created before the threads start, so that all elements share the same instances
+        # (their properties are computed only once, also if several elements access them concurrently)
+        true_aggregates = dpmreport.true_aggregates
+        dpmreport.user_aggregates
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            # submitted first, so that it is computed before the od elements wait for it
+            od_shape = (
+                executor.submit(lambda: true_aggregates.od_shape)
+                if not set(const.OD_ELEMENTS).issubset(dpmreport.analysis_exclusion)
+                else None
+            )
+            futures = {
+                executor.submit(compute_element, element, od_shape): element
+                for element in elements
             }
-        pbar.update()
-
-        report = {**report, **add_user_analysis_elements(dpmreport, eps_factor, deltai)}
-        pbar.update()
+            for future in as_completed(futures):
+                report[futures[future]] = future.result()
+                pbar.update()
 
-    return report
+    # same order as const.ELEMENTS
+    return {element: report[element] for element in elements}
 
 
 def _get_eps(eps_factor: float, analysis_name: str, budget_split: dict, gaussian: bool = False) -> float:
@@ -89,166 +123,21 @@ def _get_eps(eps_factor: float, analysis_name: str, budget_split: dict, gaussian
         return budget_split[analysis_name] * eps_factor
 
 
-def add_overview_elements(dpmreport: "DpMobilityReport", eps_factor: float, deltai: float) -> dict:
-    overview_elements: dict = {}
-
-    if (const.DS_STATISTICS in const.OVERVIEW_ELEMENTS) and (
-        const.DS_STATISTICS not in dpmreport.analysis_exclusion
-    ):
-        overview_elements[const.DS_STATISTICS] = overview.get_dataset_statistics(
-            dpmreport, _get_eps(eps_factor, const.DS_STATISTICS, dpmreport.budget_split, dpmreport.gaussian), deltai
-        )
-
-    if (const.MISSING_VALUES in const.OVERVIEW_ELEMENTS) and (
-        const.MISSING_VALUES not in dpmreport.analysis_exclusion
-    ):
-        overview_elements[const.MISSING_VALUES] = overview.get_missing_values(
-            dpmreport,
-            _get_eps(eps_factor, const.MISSING_VALUES, dpmreport.budget_split, dpmreport.gaussian), deltai
-        )
-
-    if (const.TRIPS_OVER_TIME in const.OVERVIEW_ELEMENTS) and (
-        const.TRIPS_OVER_TIME not in dpmreport.analysis_exclusion
-    ):
-        overview_elements[const.TRIPS_OVER_TIME] = overview.get_trips_over_time(
-            dpmreport,
-            _get_eps(eps_factor, const.TRIPS_OVER_TIME, dpmreport.budget_split, dpmreport.gaussian), deltai
-        )
-
-    if (const.TRIPS_PER_WEEKDAY in const.TRIPS_PER_WEEKDAY) and (
-        const.TRIPS_PER_WEEKDAY not in dpmreport.analysis_exclusion
-    ):
-        overview_elements[const.TRIPS_PER_WEEKDAY] = overview.get_trips_per_weekday(
-            dpmreport,
-            _get_eps(eps_factor, const.TRIPS_PER_WEEKDAY, dpmreport.budget_split, dpmreport.gaussian), deltai
-        )
-
-    if (const.TRIPS_PER_HOUR in const.OVERVIEW_ELEMENTS) and (
-        const.TRIPS_PER_HOUR not in dpmreport.analysis_exclusion
-    ):
-        overview_elements[const.TRIPS_PER_HOUR] = overview.get_trips_per_hour(
-            dpmreport,
-            _get_eps(eps_factor, const.TRIPS_PER_HOUR, dpmreport.budget_split, dpmreport.gaussian), deltai
-        )
-    return overview_elements
-
-
-def add_place_analysis_elements(
-    dpmreport: "DpMobilityReport",
-    eps_factor: float,
-    deltai: float
-) -> dict:
-    place_analysis_elements: dict = {}
-
-    if (const.VISITS_PER_TILE in const.PLACE_ELEMENTS) and (
-        const.VISITS_PER_TILE not in dpmreport.analysis_exclusion
-    ):
-        place_analysis_elements[
-            const.VISITS_PER_TILE
-        ] = place_analysis.get_visits_per_tile(
-            dpmreport,
-            _get_eps(eps_factor, const.VISITS_PER_TILE, dpmreport.budget_split, dpmreport.gaussian), deltai
-        )
-
-    if (const.VISITS_PER_TIME_TILE in const.PLACE_ELEMENTS) and (
-        const.VISITS_PER_TIME_TILE not in dpmreport.analysis_exclusion
-    ):
-        place_analysis_elements[
-            const.VISITS_PER_TIME_TILE
-        ] = place_analysis.get_visits_per_time_tile(
-            dpmreport,
-            _get_eps(eps_factor, const.VISITS_PER_TIME_TILE, dpmreport.budget_split, dpmreport.gaussian), deltai
-        )
-    return place_analysis_elements
-
-
-def add_od_analysis_elements(
-    dpmreport: "DpMobilityReport",
-    _od_shape: DataFrame,
-    eps_factor: float,
-    deltai: float
-) -> dict:
-    od_analysis_elements: dict = {}
-
-    if (const.OD_FLOWS in const.OD_ELEMENTS) and (
-        const.OD_FLOWS not in dpmreport.analysis_exclusion
-    ):
-        od_analysis_elements[const.OD_FLOWS] = od_analysis.get_od_flows(
-            _od_shape,
-            dpmreport,
-            _get_eps(eps_factor, const.OD_FLOWS, dpmreport.budget_split, dpmreport.gaussian), deltai
-        )
-
-    if (const.TRAVEL_TIME in const.OD_ELEMENTS) and (
-        const.TRAVEL_TIME not in dpmreport.analysis_exclusion
-    ):
-        od_analysis_elements[const.TRAVEL_TIME] = od_analysis.get_travel_time(
-            _od_shape,
-            dpmreport,
-            _get_eps(eps_factor, const.TRAVEL_TIME, dpmreport.budget_split, dpmreport.gaussian), deltai
-        )
-
-    if (const.JUMP_LENGTH in const.OD_ELEMENTS) and (
-        const.JUMP_LENGTH not in dpmreport.analysis_exclusion
-    ):
-        od_analysis_elements[const.JUMP_LENGTH] = od_analysis.get_jump_length(
-            _od_shape,
-            dpmreport,
-            _get_eps(eps_factor, const.JUMP_LENGTH, dpmreport.budget_split, dpmreport.gaussian), deltai
-        )
-
-    return od_analysis_elements
-
-
-def add_user_analysis_elements(
-    dpmreport: "DpMobilityReport", eps_factor: float,  deltai: float
-) -> dict:
-    user_analysis_elements = {}
-    if (const.TRIPS_PER_USER in const.USER_ELEMENTS) and (
-        const.TRIPS_PER_USER not in dpmreport.analysis_exclusion
-    ):
-        user_analysis_elements[const.TRIPS_PER_USER] = user_analysis.get_trips_per_user(
-            dpmreport,
-            _get_eps(eps_factor, const.TRIPS_PER_USER, dpmreport.budget_split, dpmreport.gaussian), deltai
-        )
-
-    if (const.USER_TIME_DELTA in const.USER_ELEMENTS) and (
-        const.USER_TIME_DELTA not in dpmreport.analysis_exclusion
-    ):
-        user_analysis_elements[
-            const.USER_TIME_DELTA
-        ] = user_analysis.get_user_time_delta(
-            dpmreport,
-            _get_eps(eps_factor, const.USER_TIME_DELTA, dpmreport.budget_split, dpmreport.gaussian), deltai
-        )
-
-    if (const.RADIUS_OF_GYRATION in const.USER_ELEMENTS) and (
-        const.RADIUS_OF_GYRATION not in dpmreport.analysis_exclusion
-    ):
-        user_analysis_elements[
-            const.RADIUS_OF_GYRATION
-        ] = user_analysis.get_radius_of_gyration(
-            dpmreport,
-            _get_eps(eps_factor, const.RADIUS_OF_GYRATION, dpmreport.budget_split, dpmreport.gaussian), deltai
-        )
-
-    if (const.USER_TILE_COUNT in const.USER_ELEMENTS) and (
-        const.USER_TILE_COUNT not in dpmreport.analysis_exclusion
-    ):
-        user_analysis_elements[
-            const.USER_TILE_COUNT
-        ] = user_analysis.get_user_tile_count(
-            dpmreport,
-            _get_eps(eps_factor, const.USER_TILE_COUNT, dpmreport.budget_split, dpmreport.gaussian), deltai
-        )
-
-    if (const.MOBILITY_ENTROPY in const.USER_ELEMENTS) and (
-        const.MOBILITY_ENTROPY not in dpmreport.analysis_exclusion
-    ):
-        user_analysis_elements[
-            const.MOBILITY_ENTROPY
-        ] = user_analysis.get_mobility_entropy(
-            dpmreport,
-            _get_eps(eps_factor, const.MOBILITY_ENTROPY, dpmreport.budget_split, dpmreport.gaussian), deltai
-        )
-    return user_analysis_elements
+# analysis of each report element. Od elements get the od shape as first argument.
+_ELEMENT_FUNCTIONS: Dict[str, Callable[..., Section]] = {
+    const.DS_STATISTICS: overview.get_dataset_statistics,
+    const.MISSING_VALUES: overview.get_missing_values,
+    const.TRIPS_OVER_TIME: overview.get_trips_over_time,
+    const.TRIPS_PER_WEEKDAY: overview.get_trips_per_weekday,
+    const.TRIPS_PER_HOUR: overview.get_trips_per_hour,
+    const.VISITS_PER_TILE: place_analysis.get_visits_per_tile,
+    const.VISITS_PER_TIME_TILE: place_analysis.get_visits_per_time_tile,
+    const.OD_FLOWS: od_analysis.get_od_flows,
+    const.TRAVEL_TIME: od_analysis.get_travel_time,
+    const.JUMP_LENGTH: od_analysis.get_jump_length,
+    const.TRIPS_PER_USER: user_analysis.get_trips_per_user,
+    const.USER_TIME_DELTA: user_analysis.get_user_time_delta,
+    const.RADIUS_OF_GYRATION: user_analysis.get_radius_of_gyration,
+    const.USER_TILE_COUNT: user_analysis.get_user_tile_count,
+    const.MOBILITY_ENTROPY: user_analysis.get_mobility_entropy,
+}
@@ -1,6 +1,8 @@
+import json
 import math
 from functools import partial
-from typing import Callable, Optional, Tuple, Type, Union
+from pathlib import Path
+from typing import Any, Optional, Tuple, Type, Union
 
 import folium
 import geopandas as gpd
@@ -9,13 +11,16 @@ import matplotlib as mpl
 import numpy as np
 import pandas as pd
 import seaborn as sns
-from geojson import LineString
+from branca.element import JavascriptLink
 from geopandas import GeoDataFrame
+from jinja2 import Template
 from matplotlib import pyplot as plt
+from matplotlib.collections import PathCollection
 from pandas import DataFrame
 
 import dp_mobility_report.constants as const
 from dp_mobility_report.report.html.html_utils import get_centroids
+from dp_mobility_report.visualization import v_utils
 
 sns.set_theme()
 
@@ -275,9 +280,10 @@ def choropleth_map(
     aliases: Optional[list] = None,
     layer_name: str = "Visits",
     show: bool = True,
+    tolerance: float = const.MAP_SIMPLIFY_TOLERANCE,
+    precision: int = const.MAP_COORDINATE_PRECISION,
+    geojson_asset: Optional[str] = None,
 ) -> folium.Map:
-    poly_json = counts_per_tile_gdf.to_json()
-
     if not map:
         center_x, center_y = _get_center(counts_per_tile_gdf)
         map = _basemap(center_x, center_y)
@@ -331,14 +337,37 @@ def choropleth_map(
         fields = ["tile_id", "tile_name", fill_color_name]
     else:
         fields = ["tile_id", fill_color_name]
-    folium.GeoJson(
-        poly_json,
-        name=layer_name,
-        overlay=True,
-        show=show,
-        style_function=_style_function_partial,
-        popup=folium.GeoJsonPopup(fields=fields, aliases=aliases),
-    ).add_to(map)
+
+    if geojson_asset is not None:
+        # geometries are loaded from the shared asset, the map only holds the value of each tile
+        values = counts_per_tile_gdf[fill_color_name].astype(object)
+        _SharedGeoJsonChoropleth(
+            geojson_asset,
+            dict(
+                zip(
+                    counts_per_tile_gdf[const.TILE_ID].astype(str),
+                    values.where(values.notna(), None),
+                )
+            ),
+            colors=[mpl.colors.rgb2hex(c) for c in mpl_cmap(np.arange(mpl_cmap.N))],
+            vmin=norm.vmin,
+            vcenter=norm.vcenter if is_cmap_diverging else None,
+            vmax=norm.vmax,
+            fields=fields,
+            aliases=aliases if aliases is not None else fields,
+            name=layer_name,
+            show=show,
+        ).add_to(map)
+    else:
+        folium.GeoJson(
+            # simplified tile geometries: smaller maps that render faster
+            v_utils.to_geojson(counts_per_tile_gdf, tolerance, precision),
+            name=layer_name,
+            overlay=True,
+            show=show,
+            style_function=_style_function_partial,
+            popup=folium.GeoJsonPopup(fields=fields, aliases=aliases),
+        ).add_to(map)
 
     # colorbar object to create custom legend
     colorbar, ax = plt.subplots(figsize=(6, 1))
@@ -355,6 +384,152 @@ def choropleth_map(
     return map, colorbar
 
 
+def write_tessellation_asset(
+    tessellation: GeoDataFrame,
+    folder: Union[str, Path],
+    tolerance: float = const.MAP_SIMPLIFY_TOLERANCE,
+    precision: int = const.MAP_COORDINATE_PRECISION,
+) -> None:
+    """Write the (simplified) tile geometries to a script in ``folder`` (named ``const.TESSELLATION_ASSET``) that all choropleth maps in the same folder can share, see argument ``geojson_asset`` of ``choropleth_map()``.
+    It is a script (instead of a ``.geojson`` file) so that maps can also load it from the local file system.
+    """
+    geojson = v_utils.to_geojson(
+        tessellation[[const.TILE_ID, const.TILE_NAME, tessellation.geometry.name]],
+        tolerance,
+        precision,
+    )
+    Path(folder, const.TESSELLATION_ASSET).write_text(
+        f"var {_TESSELLATION_VARIABLE} = {json.dumps(geojson)};", encoding="utf-8"
+    )
+
+
+_TESSELLATION_VARIABLE = "dpmr_tessellation"
+
+
+# choropleth layer of the tile geometries of a shared asset (see ``write_tessellation_asset()``), styled in the browser according to the value of each tile
+class _SharedGeoJsonChoropleth(folium.map.Layer):
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+        var {{ this.get_name() }}_values = {{ this.values|tojson }};
+        var {{ this.get_name() }}_colors = {{ this.colors|tojson }};
+        function {{ this.get_name() }}_color(value) {
+            if (value === null || value === undefined) {
+                return "#8c8c8c";
+            }
+            // same normalization as matplotlib's Normalize / TwoSlopeNorm
+            var vmin = {{ this.vmin|tojson }}, vcenter = {{ this.vcenter|tojson }}, vmax = {{ this.vmax|tojson }};
+            var t = vcenter === null
+                ? (vmax === vmin ? 0 : (value - vmin) / (vmax - vmin))
+                : (value < vcenter
+                    ? 0.5 * (value - vmin) / (vcenter - vmin)
+                    : 0.5 + 0.5 * (value - vcenter) / (vmax - vcenter));
+            var n = {{ this.get_name() }}_colors.length;
+            return {{ this.get_name() }}_colors[Math.min(Math.max(Math.floor(t * n), 0), n - 1)];
+        }
+        var {{ this.get_name() }} = L.geoJson({{ this.variable }}, {
+            style: function(feature) {
+                return {
+                    "fillColor": {{ this.get_name() }}_color({{ this.get_name() }}_values[feature.properties.tile_id]),
+                    "color": {{ this.line_color|tojson }},
+                    "weight": 1.5,
+                    "fillOpacity": 0.6,
+                };
+            },
+            onEachFeature: function(feature, layer) {
+                var properties = Object.assign({}, feature.properties);
+                var value = {{ this.get_name() }}_values[feature.properties.tile_id];
+                properties[{{ this.fields[-1]|tojson }}] = value === undefined ? null : value;
+                var rows = {{ this.fields|tojson }}.map(function(field, i) {
+                    return "<tr><th>" + {{ this.aliases|tojson }}[i] + "</th><td>" + properties[field] + "</td></tr>";
+                });
+                layer.bindPopup("<table>" + rows.join("") + "</table>");
+            },
+        }).addTo({{ this._parent.get_name() }});
+        {% endmacro %}
+        """
+    )
+
+    def __init__(
+        self,
+        geojson_asset: str,
+        values: dict,
+        colors: list,
+        vmin: float,
+        vcenter: Optional[float],
+        vmax: float,
+        fields: list,
+        aliases: list,
+        name: str,
+        show: bool,
+    ) -> None:
+        super().__init__(name=name, overlay=True, show=show)
+        self._name = "SharedGeoJsonChoropleth"
+        self.geojson_asset = geojson_asset
+        self.variable = _TESSELLATION_VARIABLE
+        self.values = values
+        self.colors = colors
+        self.vmin, self.vcenter, self.vmax = (
+            float(v) if v is not None else None for v in (vmin, vcenter, vmax)
+        )
+        self.fields = fields
+        self.aliases = aliases
+        self.line_color = const.GREY
+
+    def render(self, **kwargs: Any) -> None:
+        super().render(**kwargs)
+        # the asset is only loaded once, also if several layers share it
+        self.get_root().header.add_child(
+            JavascriptLink(self.geojson_asset), name="tessellation_asset"
+        )
+
+
+class _FlowLayer(folium.map.Layer):
+    # lines between origin and destination and a marker for each origin, styled in the browser by their properties
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+        var {{ this.get_name() }} = L.geoJson({{ this.data|tojson }}, {
+            style: function(feature) {
+                if (feature.geometry.type === "Point") {
+                    return {
+                        "color": {{ this.marker_color|tojson }},
+                        "fillColor": {{ this.marker_color|tojson }},
+                        "fill": true,
+                        "weight": 2,
+                    };
+                }
+                return {
+                    "color": {{ this.flow_color|tojson }},
+                    "weight": feature.properties.weight,
+                    "opacity": 0.65,
+                };
+            },
+            pointToLayer: function(feature, latlng) {
+                return L.circleMarker(latlng, {"radius": 5});
+            },
+            onEachFeature: function(feature, layer) {
+                var properties = feature.properties;
+                var popup = feature.geometry.type === "Point"
+                    ? "origin: " + properties.origin + "<br/>" + properties.top_flows.map(function(flow) {
+                        return "flow to " + flow[0] + ": " + flow[1];
+                    }).join("<br/>")
+                    : "flow from " + properties.origin + " to " + properties.destination + ": " + properties.flow;
+                layer.bindPopup(popup, {"maxWidth": 300});
+            },
+        }).addTo({{ this._parent.get_name() }});
+        {% endmacro %}
+        """
+    )
+
+    def __init__(self, data: dict, flow_color: str, marker_color: str, name: str) -> None:
+        super().__init__(name=name, overlay=True)
+        self._name = "FlowLayer"
+        self.data = data
+        self.flow_color = flow_color
+        self.marker_color = marker_color
+
+
 def multi_choropleth_map(
     counts_per_tile_timewindow: DataFrame,
     tessellation: GeoDataFrame,
@@ -362,6 +537,8 @@ def multi_choropleth_map(
     min_scale: Optional[Union[int, float]] = None,
     max_scale: Optional[Union[int, float]] = None,
     vcenter: Optional[Union[int, float]] = 0,
+    figsize: Tuple[float, float] = const.MULTI_MAP_FIGSIZE,
+    dpi: int = const.MULTI_MAP_DPI,
 ) -> mpl.figure.Figure:
     counts_per_tile_timewindow = tessellation[["tile_id", "geometry"]].merge(
         counts_per_tile_timewindow, left_on="tile_id", right_index=True, how="left"
@@ -371,7 +548,7 @@ def multi_choropleth_map(
     plot_count = counts_per_tile_timewindow.shape[1] - 2
     plots_per_row = 3
     row_count = math.ceil(plot_count / plots_per_row)
-    fig, axes = plt.subplots(row_count, plots_per_row, figsize=(18, 12))
+    fig, axes = plt.subplots(row_count, plots_per_row, figsize=figsize, dpi=dpi)
 
     # upper and lower bound
     if min_scale is None:
@@ -393,6 +570,17 @@ def multi_choropleth_map(
         cmap = const.BASE_CMAP  # STANDARD_CMAP
         norm = mpl.colors.Normalize(vmin=min_scale, vmax=max_scale)
 
+    # the tessellation is converted to paths only once, each panel only sets its own colors
+    paths, tile_index = v_utils.polygon_paths(tessellation.geometry)
+    cmap = mpl.colormaps[cmap].with_extremes(bad=const.LIGHT_GREY)
+    # same aspect as for plots of a GeoDataFrame
+    _, miny, _, maxy = tessellation.total_bounds
+    aspect = (
+        1 / math.cos(math.radians((miny + maxy) / 2))
+        if (tessellation.crs is not None) and tessellation.crs.is_geographic
+        else 1
+    )
+
     for i in range(0, plots_per_row * row_count):
         facet_row = math.ceil((i - plots_per_row + 1) / plots_per_row)
         if row_count == 1:
@@ -405,17 +593,19 @@ def multi_choropleth_map(
             counts_per_tile_timewindow.shape[1] - 2
         ):  # there might be more subplots than data - skip in that case
             column_name = counts_per_tile_timewindow.columns[i + 2]
-            counts_per_tile_timewindow.iloc[:, [i + 2, 1]].plot(
-                column=column_name,
-                cmap=cmap,
-                norm=norm,
-                linewidth=0.1,
-                ax=ax,
-                edgecolor="#FFFFFF",
-                missing_kwds={
-                    "color": const.LIGHT_GREY,
-                },
+            values = counts_per_tile_timewindow[column_name].to_numpy(dtype=float)
+            ax.add_collection(
+                PathCollection(
+                    paths,
+                    array=np.ma.masked_invalid(values[tile_index]),
+                    cmap=cmap,
+                    norm=norm,
+                    linewidth=0.1,
+                    edgecolor="#FFFFFF",
+                )
             )
+            ax.autoscale_view()
+            ax.set_aspect(aspect)
             ax.set_title(column_name)
 
     # Create colorbar as a legend
@@ -498,64 +688,72 @@ def flows(
     flow_color: str = const.DARK_BLUE,
     marker_color: str = const.LIGHT_BLUE,
     layer_name: str = "flows",
+    precision: int = const.MAP_COORDINATE_PRECISION,
 ) -> folium.Map:
-    centroids = get_centroids(tessellation)
-    mean_flows = data["flow"].mean()
-
-    def _flow_style_function(weight: float, color: str) -> Callable:
-        return lambda feature: {
-            "color": color,
-            "weight": 5 * weight**0.5,
-            "opacity": 0.65,
+    centroids = pd.DataFrame.from_dict(
+        get_centroids(tessellation), orient="index", columns=[const.LNG, const.LAT]
+    ).round(precision)
+    data = data[[const.ORIGIN, const.DESTINATION, const.FLOW]]
+    origins = centroids.loc[data[const.ORIGIN]].to_numpy()
+    destinations = centroids.loc[data[const.DESTINATION]].to_numpy()
+    weights = (5 * (data[const.FLOW] / data[const.FLOW].mean()) ** 0.5).round(2)
+
+    line_features = [
+        {
+            "type": "Feature",
+            "geometry": {
+                "type": "LineString",
+                "coordinates": [origin, destination],
+            },
+            "properties": {
+                "origin": o,
+                "destination": d,
+                "flow": int(flow),
+                "weight": weight,
+            },
         }
+        for origin, destination, o, d, flow, weight in zip(
+            origins.tolist(),
+            destinations.tolist(),
+            data[const.ORIGIN].tolist(),
+            data[const.DESTINATION].tolist(),
+            data[const.FLOW].tolist(),
+            weights.tolist(),
+        )
+    ]
 
-    feature_group = folium.FeatureGroup(name=layer_name)
-
-    origin_groups = data.groupby(by=const.ORIGIN)
-    for origin, OD in origin_groups:
-        lonO, latO = centroids[origin]
-
-        for destination, flow in OD[[const.DESTINATION, const.FLOW]].values:
-            lonD, latD = centroids[destination]
-            gjc = LineString([(lonO, latO), (lonD, latD)])
-
-            fgeojson = folium.GeoJson(
-                gjc,
-                style_function=_flow_style_function(
-                    weight=flow / mean_flows, color=flow_color
-                ),
-            )
-
-            popup = folium.Popup(
-                f"flow from {origin} to {destination}: {int(flow)}", max_width=300
+    # top 5 outgoing flows of each origin
+    top_flows = (
+        data.sort_values(const.FLOW, ascending=False, kind="stable")
+        .groupby(const.ORIGIN, sort=False)
+        .head(5)
+    )
+    top_flows = top_flows.assign(
+        top_flows=list(
+            zip(
+                top_flows[const.DESTINATION].tolist(),
+                top_flows[const.FLOW].astype(int).tolist(),
             )
-            fgeojson = fgeojson.add_child(popup)
-            feature_group.add_child(fgeojson)
-
-        # Plot marker
-        fmarker = folium.CircleMarker(
-            [latO, lonO],
-            radius=5,
-            weight=2,
-            color=marker_color,
-            fill=True,
-            fill_color=marker_color,
         )
-        T_D = [
-            [destination, int(flow)]
-            for destination, flow in OD[[const.DESTINATION, const.FLOW]].values
-        ]
-        trips_info = "<br/>".join(
-            [
-                f"flow to {destination}: {flow}"
-                for destination, flow in sorted(T_D, reverse=True)[:5]
-            ]
+    ).groupby(const.ORIGIN)["top_flows"].agg(list)
+    marker_features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": coordinates},
+            "properties": {"origin": origin, "top_flows": origin_flows},
+        }
+        for origin, origin_flows, coordinates in zip(
+            top_flows.index,
+            top_flows.tolist(),
+            centroids.loc[top_flows.index].to_numpy().tolist(),
         )
-        name = f"origin: {origin}"
-        popup = folium.Popup(name + "<br/>" + trips_info, max_width=300)
-        fmarker = fmarker.add_child(popup)
-        feature_group.add_child(fmarker)
+    ]
 
-    feature_group.add_to(basemap)
+    _FlowLayer(
+        {"type": "FeatureCollection", "features": line_features + marker_features},
+        flow_color=flow_color,
+        marker_color=marker_color,
+        name=layer_name,
+    ).add_to(basemap)
 
     return basemap
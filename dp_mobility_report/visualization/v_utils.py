@@ -1,8 +1,24 @@
 import base64
+import hashlib
 import io
+import json
 import re
+from collections import OrderedDict
+from typing import Any, Tuple
 
+import numpy as np
+import shapely
+from geopandas import GeoDataFrame, GeoSeries
 from matplotlib.figure import Figure
+from matplotlib.path import Path
+
+# GeoJSON geometries of the most recently mapped tessellations, see ``geojson_geometries()``
+_GEOJSON_CACHE: "OrderedDict[str, list]" = OrderedDict()
+_GEOJSON_CACHE_SIZE = 4
+
+# matplotlib paths of the most recently plotted tessellations, see ``polygon_paths()``
+_PATHS_CACHE: "OrderedDict[str, Tuple[list, np.ndarray]]" = OrderedDict()
+_PATHS_CACHE_SIZE = 4
 
 
 def fig_to_html(fig: Figure) -> str:
@@ -25,3 +41,129 @@ def fig_to_html_as_png(fig: Figure) -> str:
     img_string = base64.b64encode(img.getvalue()).decode("utf-8")
     html = f"<img src='data:image/png;base64,{img_string}'>"
     return html
+
+
+def geojson_geometries(
+    geometries: GeoSeries, tolerance: float, precision: int
+) -> list:
+    """Simplified GeoJSON geometries for maps: the geometries are simplified with ``tolerance`` as a coverage, i.e., borders shared by neighbouring geometries are simplified the same way, so that there are no gaps or overlaps.
+    Their coordinates are rounded to ``precision`` decimals.
+    The result is cached, so that all maps of the same tessellation only simplify it once.
+    """
+    geometries = geometries.to_numpy()
+    key = _cache_key(geometries, tolerance, precision)
+    if key in _GEOJSON_CACHE:
+        _GEOJSON_CACHE.move_to_end(key)
+        return _GEOJSON_CACHE[key]
+
+    if tolerance > 0:
+        if hasattr(shapely, "coverage_simplify"):
+            geometries = shapely.coverage_simplify(geometries, tolerance)
+        else:
+            geometries = _coverage_simplify(geometries, tolerance)
+    geometries = shapely.transform(
+        geometries, lambda coords: np.round(coords, precision)
+    )
+    geojson_geometries = [
+        None if geometry is None else json.loads(geometry)
+        for geometry in shapely.to_geojson(geometries)
+    ]
+
+    _GEOJSON_CACHE[key] = geojson_geometries
+    if len(_GEOJSON_CACHE) > _GEOJSON_CACHE_SIZE:
+        _GEOJSON_CACHE.popitem(last=False)
+    return geojson_geometries
+
+
+def _coverage_simplify(geometries: np.ndarray, tolerance: float) -> np.ndarray:
+    """Simplify polygons as a coverage for ``shapely<2.1``: their borders are split into edges between junctions, each edge is simplified once (so that neighbours share the same simplified edge) and the polygons are rebuilt from the simplified edges.
+    Polygons that collapse in the simplification keep their original geometry.
+    """
+    is_missing = shapely.is_missing(geometries)
+    polygons = geometries[~is_missing]
+    edges = shapely.get_parts(
+        shapely.line_merge(shapely.union_all(shapely.boundary(polygons)))
+    )
+    edges = shapely.simplify(edges, tolerance, preserve_topology=True)
+    faces = shapely.get_parts(shapely.polygonize(edges))
+
+    # assign each face to the polygon that contains a point of its interior (faces in gaps of the coverage are dropped)
+    face_index, polygon_index = shapely.STRtree(polygons).query(
+        shapely.point_on_surface(faces), predicate="within"
+    )
+    face_index, first = np.unique(face_index, return_index=True)
+    polygon_index = polygon_index[first]
+    simplified = polygons.copy()
+    order = np.argsort(polygon_index, kind="stable")
+    assigned, starts = np.unique(polygon_index[order], return_index=True)
+    for i, parts in zip(assigned, np.split(faces[face_index[order]], starts[1:])):
+        simplified[i] = parts[0] if len(parts) == 1 else shapely.union_all(parts)
+
+    geometries = geometries.copy()
+    geometries[~is_missing] = simplified
+    return geometries
+
+
+def polygon_paths(geometries: GeoSeries) -> Tuple[list, np.ndarray]:
+    """Matplotlib paths of (multi-)polygons, e.g., for a ``PathCollection``: one path for each polygon with its holes.
+    Also returns the position of the geometry of each path, as multi-polygons are split into several paths.
+    The result is cached, so that all plots of the same tessellation only convert it once.
+    """
+    geometries = geometries.to_numpy()
+    key = _cache_key(geometries)
+    if key in _PATHS_CACHE:
+        _PATHS_CACHE.move_to_end(key)
+        return _PATHS_CACHE[key]
+
+    polygons, polygon_index = shapely.get_parts(geometries, return_index=True)
+    rings, ring_index = shapely.get_rings(polygons, return_index=True)
+    vertices, vertex_index = shapely.get_coordinates(rings, return_index=True)
+
+    # each ring starts with a move and ends with closing the polygon
+    codes = np.full(len(vertices), Path.LINETO, dtype=Path.code_type)
+    ring_starts = np.flatnonzero(np.diff(vertex_index, prepend=-1))
+    codes[ring_starts] = Path.MOVETO
+    codes[np.append(ring_starts[1:], len(vertices)) - 1] = Path.CLOSEPOLY
+
+    polygon_starts = np.flatnonzero(np.diff(ring_index[vertex_index], prepend=-1))[1:]
+    paths = [
+        Path(polygon_vertices, polygon_codes)
+        for polygon_vertices, polygon_codes in zip(
+            np.split(vertices, polygon_starts), np.split(codes, polygon_starts)
+        )
+    ]
+
+    _PATHS_CACHE[key] = (paths, polygon_index)
+    if len(_PATHS_CACHE) > _PATHS_CACHE_SIZE:
+        _PATHS_CACHE.popitem(last=False)
+    return paths, polygon_index
+
+
+def to_geojson(gdf: GeoDataFrame, tolerance: float, precision: int) -> dict:
+    """Same as ``gdf.to_json()``, but with simplified geometries (see ``geojson_geometries()``)."""
+    properties = gdf.drop(columns=gdf.geometry.name)
+    properties = properties.astype(object).where(properties.notna(), None)
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "id": str(index),
+                "type": "Feature",
+                "properties": feature_properties,
+                "geometry": geometry,
+            }
+            for index, feature_properties, geometry in zip(
+                gdf.index,
+                properties.to_dict("records"),
+                geojson_geometries(gdf.geometry, tolerance, precision),
+            )
+        ],
+    }
+
+
+# hash of the geometries and the parameters of their conversion
+def _cache_key(geometries: np.ndarray, *params: Any) -> str:
+    sha = hashlib.sha256(repr(params).encode())
+    for wkb in shapely.to_wkb(geometries):
+        sha.update(b"" if wkb is None else wkb)
+    return sha.hexdigest()
@@ -0,0 +1,69 @@
+import math
+import timeit
+
+import diffprivlib
+import numpy as np
+
+from dp_mobility_report.privacy import diff_privacy
+
+# compare the runtime (cells per second) of the former per-cell diffprivlib noise
+# with the batched noise of diff_privacy.counts_dp
+
+
+def _legacy_laplacer(x: int, eps: float, sensitivity: int) -> int:
+    return int(
+        round(
+            diffprivlib.mechanisms.laplace.Laplace(
+                epsilon=eps, delta=0.0, sensitivity=sensitivity
+            ).randomise(x),
+            0,
+        )
+    )
+
+
+def _legacy_gaussianer(x: int, eps: float, delta: float, sensitivity: int) -> int:
+    return int(
+        round(
+            diffprivlib.mechanisms.GaussianAnalytic(
+                epsilon=eps, delta=delta, sensitivity=math.sqrt(sensitivity)
+            ).randomise(x),
+            0,
+        )
+    )
+
+
+def legacy_counts_dp(
+    counts: np.ndarray, eps: float, delta: float, sensitivity: int, gaussian: bool
+) -> np.ndarray:
+    if gaussian:
+        vfunc = np.vectorize(lambda x: _legacy_gaussianer(x, eps, delta, sensitivity))
+    else:
+        vfunc = np.vectorize(lambda x: _legacy_laplacer(x, eps, sensitivity))
+    return np.maximum(vfunc(counts), 0)
+
+
+EPS = 1
+DELTA = 0.00001
+SENSITIVITY = 5
+N_LEGACY = 20_000  # the legacy implementation is too slow for larger arrays
+N_BATCHED = 9_000_000  # e.g., od flows of a tessellation with 3,000 tiles
+
+rng = np.random.default_rng(1)
+
+for gaussian in [False, True]:
+    mechanism = "gaussian" if gaussian else "laplace"
+
+    counts = rng.poisson(5, N_LEGACY)
+    seconds = timeit.timeit(
+        lambda: legacy_counts_dp(counts, EPS, DELTA, SENSITIVITY, gaussian), number=1
+    )
+    print(f"{mechanism} before: {N_LEGACY / seconds:,.0f} cells/s")
+
+    counts = rng.poisson(5, N_BATCHED)
+    seconds = timeit.timeit(
+        lambda: diff_privacy.counts_dp(
+            counts, EPS, DELTA, SENSITIVITY, gaussian, rng=rng
+        ),
+        number=1,
+    )
+    print(f"{mechanism} after: {N_BATCHED / seconds:,.0f} cells/s")
@@ -0,0 +1,59 @@
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from dp_mobility_report import constants as const
+from dp_mobility_report.model import preprocessing
+
+# compare the runtime of the former waypoint removal (sort + groupby.nth + groupby.tail)
+# with preprocessing.preprocess_data on synthetic records
+# usage: python runtime_preprocessing.py [n_records], e.g., 10_000_000 or 100_000_000
+
+
+def legacy_remove_waypoints(df: pd.DataFrame) -> pd.DataFrame:
+    df[const.TID] = (
+        df.sort_values([const.UID, const.DATETIME])
+        .groupby([const.UID, const.TID], sort=False)
+        .ngroup()
+    )
+    df = df.sort_values(const.DATETIME).groupby(const.TID, as_index=False).nth([0, -1])
+    df[const.POINT_TYPE] = "start"
+    df.sort_values(const.DATETIME, inplace=True)
+    df.loc[
+        df.groupby(const.TID)[const.POINT_TYPE].tail(1).index, const.POINT_TYPE
+    ] = "end"
+    return df
+
+
+def synthetic_records(n_records: int, records_per_trip: int = 20) -> pd.DataFrame:
+    rng = np.random.default_rng(1)
+    n_trips = n_records // records_per_trip
+    tid = rng.permutation(np.repeat(np.arange(n_trips), records_per_trip))
+    return pd.DataFrame(
+        {
+            const.UID: tid // 5,
+            const.TID: tid,
+            const.DATETIME: pd.Timestamp("2022-01-01")
+            + pd.to_timedelta(tid * 600 + rng.integers(0, 3600, len(tid)), unit="s"),
+            const.LAT: rng.uniform(52.3, 52.7, len(tid)),
+            const.LNG: rng.uniform(13.1, 13.7, len(tid)),
+        }
+    )
+
+
+N_RECORDS = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+
+df = synthetic_records(N_RECORDS)
+
+seconds = timeit.timeit(lambda: legacy_remove_waypoints(df.copy()), number=1)
+print(f"before: {seconds:.1f} s for {N_RECORDS:,} records")
+
+seconds = timeit.timeit(
+    lambda: preprocessing.preprocess_data(
+        df.copy(), None, max_trips_per_user=5, user_privacy=False, seed=None
+    ),
+    number=1,
+)
+print(f"after: {seconds:.1f} s for {N_RECORDS:,} records")
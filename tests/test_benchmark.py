@@ -252,6 +252,20 @@ def test_benchmark_report(benchmark_report):
     assert isinstance(benchmark_report.similarity_measures, dict)
 
 
+def test_repeat(benchmark_report):
+    repetitions = benchmark_report.repeat(3, seeds=[1, 2, 3])
+    assert list(repetitions.columns) == ["mean", "std"]
+    assert const.VISITS_PER_TILE in repetitions.index
+    assert const.VISITS_PER_TILE_RANKING + "_top_10" in repetitions.index
+    assert const.VISITS_PER_TILE_RANKING not in repetitions.index
+    assert repetitions.equals(benchmark_report.repeat(3, seeds=[1, 2, 3]))
+
+    with pytest.raises(ValueError):
+        benchmark_report.repeat(3, seeds=[1, 2])
+    with pytest.raises(ValueError):
+        benchmark_report.repeat(0)
+
+
 def test_measure_selection():
 
     with pytest.warns(Warning):
@@ -338,7 +352,7 @@ def test_to_html_file(
         df_alternative=test_data_alternative,
         privacy_budget_base=15,
         privacy_budget_alternative=None,
-    ).to_file(file_name)
+    ).to_file(file_name, n_jobs=2)
     assert file_name.is_file()
 
     file_name = tmp_path / "html/test_output3.html"
@@ -382,6 +382,122 @@ def test_wrong_input_params_DpMobilityReport(
             test_data, test_tessellation, privacy_budget=None, seed_sampling=-3
         )
 
+    with pytest.raises(TypeError):
+        DpMobilityReport(
+            test_data, test_tessellation, privacy_budget=1, seed_noise="not an int"
+        )
+
+    with pytest.raises(ValueError):
+        DpMobilityReport(test_data, test_tessellation, privacy_budget=1, seed_noise=-3)
+
+    # wrong input for n_jobs
+    with pytest.raises(TypeError):
+        DpMobilityReport(test_data, test_tessellation, n_jobs="not an int")
+
+    with pytest.raises(ValueError):
+        DpMobilityReport(test_data, test_tessellation, n_jobs=0)
+
+    # wrong input for cache_dir
+    with pytest.raises(TypeError):
+        DpMobilityReport(test_data, test_tessellation, cache_dir=1)
+
+
+def test_preprocessing_cache(test_data, test_tessellation, tmp_path, monkeypatch):
+    """Preprocessed data is reused from the cache for the same data and parameters."""
+    mob_report = DpMobilityReport(
+        test_data,
+        test_tessellation,
+        max_trips_per_user=3,
+        seed_sampling=1,
+        cache_dir=tmp_path,
+    )
+    assert len(list(tmp_path.iterdir())) == 1
+
+    # no preprocessing for the cached data
+    def preprocess_data(*args, **kwargs):
+        raise AssertionError("data is preprocessed again")
+
+    monkeypatch.setattr(
+        "dp_mobility_report.model.preprocessing.preprocess_data", preprocess_data
+    )
+    cached_report = DpMobilityReport(
+        test_data,
+        test_tessellation,
+        max_trips_per_user=3,
+        seed_sampling=1,
+        cache_dir=tmp_path,
+    )
+    assert cached_report.df.equals(mob_report.df)
+    assert (cached_report.df.dtypes == mob_report.df.dtypes).all()
+    assert cached_report.max_trips_per_user == mob_report.max_trips_per_user
+
+    # different sampling or data is not read from the cache
+    with pytest.raises(AssertionError):
+        DpMobilityReport(
+            test_data,
+            test_tessellation,
+            max_trips_per_user=3,
+            seed_sampling=2,
+            cache_dir=tmp_path,
+        )
+    with pytest.raises(AssertionError):
+        DpMobilityReport(
+            test_data.iloc[1:],
+            test_tessellation,
+            max_trips_per_user=3,
+            seed_sampling=1,
+            cache_dir=tmp_path,
+        )
+
+    # a random down-sampling is never cached
+    with pytest.raises(AssertionError):
+        DpMobilityReport(
+            test_data,
+            test_tessellation,
+            max_trips_per_user=3,
+            cache_dir=tmp_path,
+        )
+
+
+def test_preprocessing_cache_file(test_data, test_tessellation, tmp_path, monkeypatch):
+    """A file is not read again for cached data."""
+    file_name = tmp_path / "test_data.csv"
+    test_data.to_csv(file_name, index=False)
+    cache_dir = tmp_path / "cache"
+    mob_report = DpMobilityReport(
+        file_name,
+        test_tessellation,
+        max_trips_per_user=3,
+        seed_sampling=1,
+        cache_dir=cache_dir,
+    )
+
+    def read_trip_ends(*args, **kwargs):
+        raise AssertionError("file is read again")
+
+    monkeypatch.setattr(
+        "dp_mobility_report.model.ingestion.read_trip_ends", read_trip_ends
+    )
+    cached_report = DpMobilityReport(
+        file_name,
+        test_tessellation,
+        max_trips_per_user=3,
+        seed_sampling=1,
+        cache_dir=cache_dir,
+    )
+    assert cached_report.df.equals(mob_report.df)
+
+    # a changed file is read again
+    test_data.iloc[1:].to_csv(file_name, index=False)
+    with pytest.raises(AssertionError):
+        DpMobilityReport(
+            file_name,
+            test_tessellation,
+            max_trips_per_user=3,
+            seed_sampling=1,
+            cache_dir=cache_dir,
+        )
+
 
 def test_report_output(test_data, test_data_sequence, test_tessellation):
     report = DpMobilityReport(test_data, test_tessellation, privacy_budget=None).report
@@ -741,6 +857,8 @@ def test_to_html_file(test_data, test_data_sequence, test_tessellation, tmp_path
         file_name
     )
     assert file_name.is_file()
+    # tile geometries are shared by all maps
+    assert (tmp_path / "html/test_output1/maps" / const.TESSELLATION_ASSET).is_file()
 
     file_name = tmp_path / "html/test_output2.html"
     DpMobilityReport(test_data, test_tessellation, privacy_budget=0.1).to_file(
@@ -748,6 +866,13 @@ def test_to_html_file(test_data, test_data_sequence, test_tessellation, tmp_path
     )
     assert file_name.is_file()
 
+    # segments rendered in separate processes
+    file_name = tmp_path / "html/test_output2_n_jobs.html"
+    DpMobilityReport(test_data, test_tessellation, privacy_budget=0.1).to_file(
+        file_name, n_jobs=2
+    )
+    assert file_name.is_file()
+
     file_name = tmp_path / "html/test_output3.html"
     DpMobilityReport(
         test_data,
@@ -758,7 +883,7 @@ def test_to_html_file(test_data, test_data_sequence, test_tessellation, tmp_path
             const.TRIPS_PER_USER,
         ],
         privacy_budget=None,
-    ).to_file(file_name)
+    ).to_file(file_name, map_simplify_tolerance=0)
     assert file_name.is_file()
 
     # without tessellation
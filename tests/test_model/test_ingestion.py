@@ -0,0 +1,124 @@
+import geopandas as gpd
+import pandas as pd
+import pytest
+
+from dp_mobility_report import DpMobilityReport
+from dp_mobility_report import constants as const
+from dp_mobility_report.model import ingestion
+
+
+@pytest.fixture
+def test_data():
+    """Load a test dataset."""
+    return pd.read_csv("tests/test_files/test_data.csv")
+
+
+@pytest.fixture
+def test_tessellation():
+    """Load a test tessellation."""
+    return gpd.read_file("tests/test_files/test_tessellation.geojson")
+
+
+def test_reduce_to_trip_ends():
+    """Only the first and last record of each trip are kept, also if trips span several chunks."""
+    df = pd.DataFrame(
+        {
+            const.UID: [1, 1, 1, 1, 2, 2, 1],
+            const.TID: [1, 1, 2, 1, 1, 1, 1],
+            const.DATETIME: [
+                "2020-01-01 10:00",
+                "2020-01-01 08:00",
+                "2020-01-01 12:00",
+                "2020-01-01 09:00",
+                "2020-01-01 10:00",
+                "2020-01-01 10:00",
+                "2020-01-01 11:00",
+            ],
+            const.LAT: [52.5] * 7,
+            const.LNG: [13.4] * 7,
+            "waypoint_info": list("abcdefg"),
+        }
+    )
+    trip_ends = ingestion.reduce_to_trip_ends([df.iloc[:2], df.iloc[2:5], df.iloc[5:]])
+    # records in original order, ties of timestamps keep the first and last record
+    assert trip_ends[const.DATETIME].tolist() == pd.to_datetime(
+        df[const.DATETIME].iloc[[1, 2, 4, 5, 6]]
+    ).tolist()
+    assert list(trip_ends.columns) == [
+        const.UID,
+        const.TID,
+        const.DATETIME,
+        const.LAT,
+        const.LNG,
+    ]
+    assert trip_ends.equals(ingestion.reduce_to_trip_ends([df]))
+
+    with pytest.raises(TypeError):
+        ingestion.reduce_to_trip_ends([df, "not a DataFrame"])
+    with pytest.raises(ValueError):
+        ingestion.reduce_to_trip_ends([df.drop(columns=const.TID)])
+    with pytest.raises(ValueError):
+        ingestion.reduce_to_trip_ends([])
+
+
+def test_read_trip_ends_mixed_id_types(tmp_path):
+    """Ids are the same across chunks, also if the type of ids differs between chunks."""
+    df = pd.DataFrame(
+        {
+            const.UID: ["1", "1", "1", "a1", "1"],
+            const.TID: ["1", "1", "1", "b1", "1"],
+            const.DATETIME: [f"2020-01-01 0{hour}:00" for hour in range(5)],
+            const.LAT: [52.5] * 5,
+            const.LNG: [13.4] * 5,
+        }
+    )
+    expected = ingestion.reduce_to_trip_ends([df])
+    assert expected[const.DATETIME].tolist() == pd.to_datetime(
+        df[const.DATETIME].iloc[[0, 3, 4]]
+    ).tolist()
+
+    # the first chunk only has numeric ids
+    df.to_csv(tmp_path / "test_data.csv", index=False)
+    assert ingestion.read_trip_ends(tmp_path / "test_data.csv", 2).equals(expected)
+    chunks = [df.iloc[:2].astype({const.UID: int, const.TID: int}), df.iloc[2:]]
+    assert ingestion.read_trip_ends(chunks, 2).equals(expected)
+    chunks = [df.iloc[:2], df.iloc[2:].astype({const.UID: object, const.TID: object})]
+    chunks[1].loc[4, [const.UID, const.TID]] = 1
+    assert ingestion.read_trip_ends(chunks, 2).equals(expected)
+
+
+def test_chunked_report(test_data, test_tessellation, tmp_path):
+    """A report on data in chunks equals the report on the full data."""
+    columns = [
+        const.UID,
+        const.TID,
+        const.DATETIME,
+        const.LAT,
+        const.LNG,
+        const.TILE_ID,
+        const.POINT_TYPE,
+    ]
+    df = DpMobilityReport(
+        test_data, test_tessellation, max_trips_per_user=3, seed_sampling=1
+    ).df[columns]
+
+    chunks = (test_data.iloc[i : i + 15] for i in range(0, len(test_data), 15))
+    chunked_df = DpMobilityReport(
+        chunks, test_tessellation, max_trips_per_user=3, seed_sampling=1
+    ).df[columns]
+    assert chunked_df.reset_index(drop=True).equals(df.reset_index(drop=True))
+
+    test_data.to_csv(tmp_path / "test_data.csv", index=False)
+    file_df = DpMobilityReport(
+        tmp_path / "test_data.csv",
+        test_tessellation,
+        max_trips_per_user=3,
+        seed_sampling=1,
+        chunk_size=20,
+    ).df[columns]
+    assert file_df.reset_index(drop=True).equals(df.reset_index(drop=True))
+
+    with pytest.raises(TypeError):
+        DpMobilityReport(tmp_path / "test_data.txt", test_tessellation)
+    with pytest.raises(ValueError):
+        DpMobilityReport(tmp_path / "test_data.csv", test_tessellation, chunk_size=0)
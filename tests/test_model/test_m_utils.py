@@ -11,6 +11,24 @@ def test_haversine_dist():
     assert round(haversine_dist, 3) == 2.498
 
 
+def test_haversine_dists():
+    coords = np.array(
+        [
+            [52.5217, 13.4135, 52.5162, 13.3777],
+            [52.5281, 13.3416, 52.5082, 13.3459],
+            [52.5082, 13.3459, 52.5082, 13.3459],
+        ]
+    )
+    expected = [m_utils.haversine_dist(row) for row in coords]
+    dists = m_utils.haversine_dists(coords[:, 0], coords[:, 1], coords[:, 2], coords[:, 3])
+    assert np.allclose(dists, expected)
+    assert dists[2] == 0
+    dists_chunked = m_utils.haversine_dists(
+        coords[:, 0], coords[:, 1], coords[:, 2], coords[:, 3], chunk_size=2
+    )
+    assert np.allclose(dists_chunked, expected)
+
+
 def test_cut_outliers():
     data = np.array([1, 4, 5, 6, 10])
     cut_data = m_utils.cut_outliers(data, min_value=2, max_value=9)
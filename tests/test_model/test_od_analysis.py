@@ -61,6 +61,16 @@ def test_get_od_flows(test_od_shape, test_dpmreport):
     assert od_flows.values[1].tolist() == ["2", "4", 49]
 
 
+def test_get_od_flows_dp(test_od_shape, test_dpmreport):
+    od_flows = od_analysis.get_od_flows(test_od_shape, test_dpmreport, 1, None).data
+    assert od_flows.columns.tolist() == ["origin", "destination", "flow"]
+    assert all(od_flows.flow > 0)
+    assert not od_flows.duplicated(["origin", "destination"]).any()
+    tile_ids = test_dpmreport.tessellation.tile_id.tolist()
+    assert od_flows.origin.isin(tile_ids).all()
+    assert od_flows.destination.isin(tile_ids).all()
+
+
 def test_get_intra_tile_flows():
     od_flows = pd.DataFrame(
         data={"origin": [1, 2], "destination": [3, 4], "flow": [10, 20]}
@@ -64,7 +64,7 @@ def test_get_trips_per_weekday(test_dpmreport):
 
     # test that all days are created even if not present in data
     test_dpmreport._df = test_dpmreport.df[
-        test_dpmreport.df[const.DAY_NAME] == "Monday"
+        test_dpmreport.df[const.DATETIME].dt.day_name() == "Monday"
     ]
     trips_per_weekday = overview.get_trips_per_weekday(test_dpmreport, None).data
     assert trips_per_weekday.index.tolist() == [
@@ -1,4 +1,5 @@
 import geopandas as gpd
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -34,3 +35,22 @@ def test_get_visits_per_time_tile(test_dpmreport):
     assert visits_timewindow[("weekday", "1: 2-6")].round(2).tolist() == [0, 0, 3, 7]
     assert visits_timewindow[("weekend", "4: 14-18")].round(2).tolist() == [0, 0, 2, 0]
     assert visits_timewindow[("weekday", "3: 10-14")].round(2).tolist() == [0, 0, 7, 6]
+
+
+def test_hour_bins():
+    """Each hour of the day is mapped to the label of its time window."""
+    timewindows = np.array([2, 6, 10, 14, 18, 22])
+    hour_to_window, labels = place_analysis._hour_bins(timewindows)
+    assert len(hour_to_window) == 24
+    for hour in range(24):
+        assert labels[hour_to_window[hour]] == place_analysis._get_hour_bin(
+            hour, timewindows
+        )
+    assert labels[hour_to_window[[0, 1, 2, 21, 22, 23]]].tolist() == [
+        "6: 22-2",
+        "6: 22-2",
+        "1: 2-6",
+        "5: 18-22",
+        "6: 22-2",
+        "6: 22-2",
+    ]
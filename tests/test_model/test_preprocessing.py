@@ -4,6 +4,8 @@ import geopandas as gpd
 import numpy as np
 import pandas as pd
 import pytest
+import shapely
+from shapely.geometry import box
 
 from dp_mobility_report import constants as const
 from dp_mobility_report.model import preprocessing
@@ -76,6 +78,25 @@ def test_preprocess_data(test_data, test_tessellation, caplog):
         const.POINT_TYPE,
     }
 
+    # compact representation with labels as categories
+    assert isinstance(processed_data[const.UID].dtype, pd.CategoricalDtype)
+    assert isinstance(processed_data[const.TILE_ID].dtype, pd.CategoricalDtype)
+    assert processed_data[const.TILE_ID].cat.categories.tolist()[:4] == [
+        "1",
+        "2",
+        "3",
+        "4",
+    ]
+    assert processed_data[const.TID].dtype == np.int32
+    assert processed_data[const.POINT_TYPE].cat.categories.tolist() == [
+        const.START,
+        const.END,
+    ]
+    assert processed_data[const.IS_WEEKEND].cat.categories.tolist() == [
+        const.WEEKDAY,
+        const.WEEKEND,
+    ]
+
     # all waypoints are removed
     n_per_tid = processed_data.groupby(const.TID).count()[const.ID]
     assert max(n_per_tid) <= 2
@@ -145,6 +166,72 @@ def test_assign_points_to_tessellation(test_data, test_tessellation):
     )
 
 
+def test_assign_points_to_regular_grid():
+    """Points are assigned to the tiles of a regular grid without a spatial join."""
+    grid = gpd.GeoDataFrame(
+        {
+            const.TILE_ID: ["a", "b", "c", "d"],
+            const.TILE_NAME: ["a", "b", "c", "d"],
+            const.GEOMETRY: [
+                box(13.0, 52.0, 13.1, 52.1),
+                box(13.1, 52.0, 13.2, 52.1),
+                box(13.0, 52.1, 13.1, 52.2),
+                box(13.1, 52.1, 13.2, 52.2),
+            ],
+        },
+        crs=const.DEFAULT_CRS,
+    )
+    assert preprocessing._regular_grid(grid) is not None
+    df = pd.DataFrame(
+        {
+            const.LAT: [52.05, 52.05, 52.15, 52.15, 53.0],
+            const.LNG: [13.05, 13.15, 13.05, 13.15, 13.05],
+        }
+    )
+    assigned_df = preprocessing.assign_points_to_tessellation(df, grid)
+    assert assigned_df.tile_id.tolist()[:4] == ["a", "b", "c", "d"]
+    assert assigned_df.tile_id.isna().tolist() == [False] * 4 + [True]
+
+    # same assignment as for arbitrary polygons
+    assert preprocessing._tile_index_in_polygons(
+        df[const.LNG].to_numpy(), df[const.LAT].to_numpy(), grid
+    ).tolist() == [0, 1, 2, 3, -1]
+
+
+def test_assign_points_to_regular_grid_borders():
+    """Points on borders and on the outer edge of a grid get the same tile as with polygons, i.e., the first tile that contains them."""
+    # tiles not in grid order and coordinates that are not exact in floating point
+    geometries = [
+        box(13.0 + 0.1 * col, 52.0 + 0.1 * row, 13.1 + 0.1 * col, 52.1 + 0.1 * row)
+        for row in range(3)
+        for col in range(3)
+    ][::-1]
+    grid = gpd.GeoDataFrame(
+        {
+            const.TILE_ID: range(9),
+            const.TILE_NAME: range(9),
+            const.GEOMETRY: geometries,
+        },
+        crs=const.DEFAULT_CRS,
+    )
+    grid_parameters = preprocessing._regular_grid(grid)
+    assert grid_parameters is not None
+
+    # all corners and edge midpoints of all tiles, points just outside and missing coordinates
+    corners = shapely.get_coordinates(grid.geometry.boundary)
+    lngs = np.concatenate(
+        [corners[:, 0], corners[:, 0] + 0.05, [12.9999, 13.3001, 13.05, np.nan]]
+    )
+    lats = np.concatenate([corners[:, 1], corners[:, 1], [52.05, 52.05, 52.3, 52.05]])
+    tile_index = preprocessing._tile_index_in_grid(lngs, lats, *grid_parameters)
+    assert tile_index.tolist() == (
+        preprocessing._tile_index_in_polygons(lngs, lats, grid).tolist()
+    )
+    # the outer edge of the grid is part of its tiles
+    assert (tile_index[: len(corners)] >= 0).all()
+    assert tile_index[-4:].tolist() == [-1, -1, 2, -1]
+
+
 def test_sample_trips(test_data):
     # same length, if max_trips_per_user are max
     sampled_data = preprocessing.sample_trips(
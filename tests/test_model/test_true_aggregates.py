@@ -0,0 +1,159 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import geopandas as gpd
+import pandas as pd
+import pytest
+
+from dp_mobility_report import DpMobilityReport
+from dp_mobility_report import constants as const
+from dp_mobility_report.model import od_analysis
+
+
+@pytest.fixture
+def test_data():
+    """Load a test dataset."""
+    return pd.read_csv("tests/test_files/test_data.csv")
+
+
+@pytest.fixture
+def test_tessellation():
+    """Load a test tessellation."""
+    return gpd.read_file("tests/test_files/test_tessellation.geojson")
+
+
+def test_true_aggregates(test_data, test_tessellation):
+    """True aggregates are computed once and equal the report without noise."""
+    dpmreport = DpMobilityReport(
+        test_data, test_tessellation, privacy_budget=None, disable_progress_bar=True
+    )
+    true_aggregates = dpmreport.true_aggregates
+    assert true_aggregates is dpmreport.true_aggregates
+    assert true_aggregates.od_shape is true_aggregates.od_shape
+
+    statistics = true_aggregates.dataset_statistics
+    report_statistics = dpmreport.report[const.DS_STATISTICS].data
+    for stat in [
+        const.N_COMPLETE_TRIPS,
+        const.N_INCOMPLETE_TRIPS,
+        const.N_USERS,
+        const.N_LOCATIONS,
+    ]:
+        assert statistics[stat] == report_statistics[stat]
+    assert true_aggregates.trips_per_hour.sum() == len(dpmreport.df)
+    assert true_aggregates.visits_per_tile.visits.sum() == (
+        len(dpmreport.df) - true_aggregates.n_outside_tessellation
+    )
+
+    # aggregates are recomputed if the data is replaced
+    user_aggregates = dpmreport.user_aggregates
+    assert user_aggregates is dpmreport.user_aggregates
+    dpmreport._df = dpmreport.df[dpmreport.df[const.HOUR] == 16]
+    assert dpmreport.true_aggregates is not true_aggregates
+    assert dpmreport.user_aggregates is not user_aggregates
+    assert dpmreport.user_aggregates.n_records.sum() == len(dpmreport.df)
+    assert dpmreport.true_aggregates.trips_per_hour.sum() == len(dpmreport.df)
+
+
+def test_release(test_data, test_tessellation):
+    """A release from the true aggregates equals a new report with the same privacy settings."""
+    dpmreport = DpMobilityReport(
+        test_data,
+        test_tessellation,
+        privacy_budget=None,
+        max_trips_per_user=5,
+        seed_sampling=1,
+        disable_progress_bar=True,
+    )
+    release = dpmreport.true_aggregates.release(1, seed=1)
+    dp_report = DpMobilityReport(
+        test_data,
+        test_tessellation,
+        privacy_budget=1,
+        max_trips_per_user=5,
+        seed_sampling=1,
+        seed_noise=1,
+        disable_progress_bar=True,
+    ).report
+
+    assert list(release.keys()) == list(dp_report.keys())
+    assert release[const.DS_STATISTICS].data == dp_report[const.DS_STATISTICS].data
+    assert release[const.VISITS_PER_TILE].data.equals(
+        dp_report[const.VISITS_PER_TILE].data
+    )
+    assert release[const.TRIPS_PER_HOUR].data.equals(
+        dp_report[const.TRIPS_PER_HOUR].data
+    )
+    assert release[const.JUMP_LENGTH].quartiles.equals(
+        dp_report[const.JUMP_LENGTH].quartiles
+    )
+    assert release[const.MOBILITY_ENTROPY].data[0].tolist() == (
+        dp_report[const.MOBILITY_ENTROPY].data[0].tolist()
+    )
+    assert release[const.USER_TIME_DELTA].privacy_budget == (
+        dp_report[const.USER_TIME_DELTA].privacy_budget
+    )
+
+    # the original report is not affected
+    assert dpmreport.privacy_budget is None
+    assert dpmreport.report[const.VISITS_PER_TILE].privacy_budget is None
+
+    # different seeds, different noise
+    assert not dpmreport.true_aggregates.release(1, seed=2)[
+        const.VISITS_PER_TILE
+    ].data.equals(release[const.VISITS_PER_TILE].data)
+
+    with pytest.raises(ValueError):
+        dpmreport.true_aggregates.release(-1)
+    with pytest.raises(TypeError):
+        dpmreport.true_aggregates.release(1, gaussian="yes")
+    with pytest.raises(TypeError):
+        dpmreport.true_aggregates.release(1, seed="not an int")
+
+
+def test_missing_timestamps(test_data, test_tessellation):
+    """Records without timestamp are kept, but not counted in time related aggregates."""
+    test_data.loc[[0, 5, 8], const.DATETIME] = None
+    dpmreport = DpMobilityReport(
+        test_data, test_tessellation, privacy_budget=None, disable_progress_bar=True
+    )
+    assert dpmreport.df[const.HOUR].isna().sum() > 0
+    assert len(dpmreport.df) == len(
+        DpMobilityReport(
+            pd.read_csv("tests/test_files/test_data.csv"),
+            test_tessellation,
+            privacy_budget=None,
+        ).df
+    )
+
+    true_aggregates = dpmreport.true_aggregates
+    n_with_hour = dpmreport.df[const.HOUR].notna().sum()
+    assert true_aggregates.trips_per_hour.sum() == n_with_hour
+    assert true_aggregates.trip_ends.notna().all()
+    assert true_aggregates.visits_per_time_tile[0].sum() <= n_with_hour
+
+    report = dpmreport.report
+    assert report[const.TRIPS_OVER_TIME].data.trip_count.sum() == len(
+        true_aggregates.trip_ends
+    )
+
+
+def test_concurrent_access(test_data, test_tessellation, monkeypatch):
+    """Aggregates are computed only once, also if several threads access them at the same time."""
+    dpmreport = DpMobilityReport(
+        test_data, test_tessellation, privacy_budget=None, disable_progress_bar=True
+    )
+    true_aggregates = dpmreport.true_aggregates
+    get_od_shape = od_analysis.get_od_shape
+    n_calls = []
+
+    def slow_get_od_shape(df):
+        n_calls.append(1)
+        time.sleep(0.1)
+        return get_od_shape(df)
+
+    monkeypatch.setattr(od_analysis, "get_od_shape", slow_get_od_shape)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        od_shapes = list(executor.map(lambda _: true_aggregates.od_shape, range(4)))
+    assert len(n_calls) == 1
+    assert all(od_shape is od_shapes[0] for od_shape in od_shapes)
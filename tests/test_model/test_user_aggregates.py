@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from dp_mobility_report.model.user_aggregates import UserAggregates
+
+
+def test_user_aggregates():
+    df = pd.DataFrame(
+        data={
+            "uid": ["b", "a", "a", "a", "b", "c"],
+            "tid": [4, 1, 1, 2, 3, 5],
+            "tile_id": ["1", "2", "1", "1", None, "3"],
+            "lat": [52.0, 52.5, 53.0, 52.0, 54.0, 51.0],
+            "lng": [13.0, 13.5, 13.0, 14.0, 15.0, 12.0],
+            "datetime": pd.to_datetime(
+                [
+                    "2021-01-02",
+                    "2021-01-01",
+                    "2021-01-03",
+                    "2021-01-04",
+                    "2021-01-01",
+                    "2021-01-05",
+                ]
+            ),
+        }
+    )
+    user_aggregates = UserAggregates(df)
+    assert user_aggregates.users.tolist() == ["a", "b", "c"]
+    assert user_aggregates.user_codes.tolist() == [1, 0, 0, 0, 1, 2]
+    assert user_aggregates.n_records.tolist() == [3, 2, 1]
+    assert user_aggregates.trips_per_user.tolist() == [2, 2, 1]
+    assert user_aggregates.user_tile_count.tolist() == [2, 1, 1]
+    assert user_aggregates.tile_visit_counts.sum() == 5
+    com_lat, com_lng = user_aggregates.center_of_mass
+    assert np.allclose(com_lat, [52.5, 53.0, 51.0])
+    assert np.allclose(com_lng, [13.5, 14.0, 12.0])
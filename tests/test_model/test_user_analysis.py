@@ -5,6 +5,7 @@ import pytest
 
 from dp_mobility_report import DpMobilityReport
 from dp_mobility_report.model import user_analysis
+from dp_mobility_report.model.user_aggregates import UserAggregates
 
 
 @pytest.fixture
@@ -130,3 +131,17 @@ def test_get_mobility_entropy(test_dpmreport):
         0.99,
         1.00,
     ]
+
+
+def test_mobility_entropy_by_user():
+    df = pd.DataFrame(
+        data={
+            "id": range(9),
+            "uid": ["a", "a", "a", "a", "b", "b", "c", "c", "c"],
+            "tile_id": ["1", "2", "1", "2", "1", "1", "1", "2", None],
+        }
+    )
+    # a: uniform over 2 tiles, b: single tile, c: uniform over 2 tiles (record outside of tessellation ignored)
+    user_aggregates = UserAggregates(df)
+    assert user_analysis._mobility_entropy(user_aggregates).tolist() == [1, 0, 1]
+    assert user_aggregates.user_tile_count.tolist() == [2, 1, 2]
@@ -46,24 +46,106 @@ def test_quartiles_dp():
     assert np.issubdtype(quartiles.dtype, np.timedelta64)
 
 
+def test_exponential_mechanism():
+    rng = np.random.default_rng(1)
+    k, quant, eps, sensitivity = 20, 0.25, 0.5, 1
+    indices = np.array(
+        [
+            diff_privacy.exponential_mechanism_index(k, quant, eps, sensitivity, rng)
+            for _ in range(50000)
+        ]
+    )
+    assert all((indices >= 0) & (indices < k))
+    utility = -np.abs(np.arange(0, k) - quant * k)
+    probabilities = np.exp(eps * utility / (2 * sensitivity))
+    probabilities = probabilities / probabilities.sum()
+    frequencies = np.bincount(indices, minlength=k) / len(indices)
+    assert np.abs(frequencies - probabilities).max() < 0.01
+
+    # margin: smallest distance around the mode that covers 95% of the probability mass
+    probabilities = np.exp(eps * -np.abs(np.arange(0, k) - k / 2) / (2 * sensitivity))
+    probabilities = probabilities / probabilities.sum()
+    margin = diff_privacy.exponential_mechanism_margin(k, 0.5, eps, sensitivity, 0.95)
+    mode = k // 2
+    assert probabilities[mode - margin : mode + margin + 1].sum() >= 0.95
+    assert probabilities[mode - margin + 1 : mode + margin].sum() < 0.95
+
+
 def test_counts_dp():
     count = 10
-    dp_count = diff_privacy.count_dp(count, eps=None, sensitivity=None)
+    dp_count = diff_privacy.count_dp(
+        count, eps=None, sensitivity=None, gaussian=False, delta=None
+    )
     assert dp_count == count
 
     count = 10
-    dp_count = diff_privacy.count_dp(count, eps=0.1, sensitivity=1, nonzero=False)
+    dp_count = diff_privacy.count_dp(
+        count, eps=0.1, sensitivity=1, gaussian=False, delta=None, nonzero=False
+    )
     assert isinstance(dp_count, int)
     assert dp_count >= 0
 
     counts = np.array([100, 10, 4, 20])
-    dp_counts = diff_privacy.counts_dp(counts, eps=None, sensitivity=None)
+    dp_counts = diff_privacy.counts_dp(
+        counts, eps=None, delta=None, sensitivity=None, gaussian=False
+    )
     assert all(counts == dp_counts)
 
     counts = np.array([100, 10, 4, 20])
-    dp_counts = diff_privacy.counts_dp(counts, eps=0.1, sensitivity=1)
+    dp_counts = diff_privacy.counts_dp(
+        counts, eps=0.1, delta=None, sensitivity=1, gaussian=False
+    )
     assert all(dp_counts >= 0)
 
+    dp_counts = diff_privacy.counts_dp(
+        counts, eps=0.1, delta=0.00001, sensitivity=1, gaussian=True
+    )
+    assert dp_counts.shape == counts.shape
+    assert all(dp_counts >= 0)
+
+    dp_counts = diff_privacy.counts_dp(
+        -counts, eps=0.1, delta=None, sensitivity=1, gaussian=False, allow_negative=True
+    )
+    assert any(dp_counts < 0)
+
+    # seeded generator gives reproducible noise
+    dp_counts_1 = diff_privacy.counts_dp(
+        counts, 0.1, None, 1, False, rng=np.random.default_rng(1)
+    )
+    dp_counts_2 = diff_privacy.counts_dp(
+        counts, 0.1, None, 1, False, rng=np.random.default_rng(1)
+    )
+    assert all(dp_counts_1 == dp_counts_2)
+
+
+def test_noise():
+    rng = np.random.default_rng(1)
+    laplace_noise = diff_privacy.noise(100000, 0.5, None, 2, False, rng)
+    assert laplace_noise.shape == (100000,)
+    # std of laplace distribution: sqrt(2) * scale
+    assert np.isclose(laplace_noise.std(), np.sqrt(2) * 2 / 0.5, rtol=0.05)
+
+    gaussian_noise = diff_privacy.noise(100000, 0.5, 0.00001, 4, True, rng)
+    scale = diff_privacy.gaussian_scale(0.5, 0.00001, 4)
+    assert np.isclose(gaussian_noise.std(), scale, rtol=0.05)
+
+
+def test_zero_counts_dp():
+    rng = np.random.default_rng(1)
+    n_zeros = 100000
+    positions, values = diff_privacy.zero_counts_dp(n_zeros, 1, None, 1, False, rng)
+    assert len(positions) == len(values)
+    assert len(np.unique(positions)) == len(positions)
+    assert all((positions >= 0) & (positions < n_zeros))
+    assert all(values > 0)
+    # same number of positive counts as noising all zeros
+    dense = diff_privacy.counts_dp(np.zeros(n_zeros), 1, None, 1, False, rng=rng)
+    assert np.isclose(len(values), (dense > 0).sum(), rtol=0.05)
+    assert np.isclose(values.mean(), dense[dense > 0].mean(), rtol=0.05)
+
+    positions, values = diff_privacy.zero_counts_dp(0, 1, None, 1, False, rng)
+    assert len(positions) == 0
+
 
 def test_confidence_interval():
     pass
@@ -62,3 +62,43 @@ def test_report_elements(test_dpmreport):
         list(elements.keys())
         == const.OVERVIEW_ELEMENTS + [const.VISITS_PER_TILE] + const.USER_ELEMENTS
     )
+
+
+def test_report_elements_concurrently():
+    test_data = pd.read_csv("tests/test_files/test_data.csv")
+    test_tessellation = gpd.read_file("tests/test_files/test_tessellation.geojson")
+
+    def dp_report(n_jobs: int) -> dict:
+        dpmreport = DpMobilityReport(
+            test_data,
+            test_tessellation,
+            privacy_budget=1,
+            max_trips_per_user=5,
+            seed_sampling=1,
+            seed_noise=1,
+            n_jobs=n_jobs,
+            disable_progress_bar=True,
+        )
+        df = dpmreport.df.copy()
+        report = dpmreport.report
+        # analyses do not write to the processed data
+        assert dpmreport.df.equals(df)
+        return report
+
+    sequential_report = dp_report(n_jobs=1)
+    concurrent_report = dp_report(n_jobs=4)
+    assert list(sequential_report.keys()) == list(concurrent_report.keys())
+
+    # same noise, independent of the order of execution
+    assert sequential_report[const.DS_STATISTICS].data == (
+        concurrent_report[const.DS_STATISTICS].data
+    )
+    assert sequential_report[const.VISITS_PER_TILE].data.equals(
+        concurrent_report[const.VISITS_PER_TILE].data
+    )
+    assert sequential_report[const.OD_FLOWS].data.equals(
+        concurrent_report[const.OD_FLOWS].data
+    )
+    assert sequential_report[const.JUMP_LENGTH].quartiles.equals(
+        concurrent_report[const.JUMP_LENGTH].quartiles
+    )
@@ -0,0 +1,76 @@
+import json
+from collections import OrderedDict
+
+import geopandas as gpd
+import numpy as np
+import pytest
+import shapely
+
+from dp_mobility_report.visualization import v_utils
+
+
+@pytest.fixture
+def noisy_tessellation():
+    """Voronoi tessellation, whose borders have many small random bends."""
+    rng = np.random.default_rng(0)
+    extent = shapely.box(13, 52, 13.05, 52.05)
+    tiles = shapely.intersection(
+        shapely.get_parts(
+            shapely.voronoi_polygons(
+                shapely.multipoints(rng.uniform((13, 52), (13.05, 52.05), (20, 2))),
+                extend_to=extent,
+            )
+        ),
+        extent,
+    )
+    edges = shapely.get_parts(
+        shapely.line_merge(shapely.union_all(shapely.boundary(tiles)))
+    )
+
+    def add_noise(coords):
+        coords = coords.copy()
+        coords[1:-1] += rng.uniform(-0.00015, 0.00015, coords[1:-1].shape)
+        return coords
+
+    edges = [shapely.transform(shapely.segmentize(e, 0.001), add_noise) for e in edges]
+    return gpd.GeoSeries(shapely.get_parts(shapely.polygonize(edges)), crs=4326)
+
+
+@pytest.mark.parametrize("shapely_coverage_simplify", [True, False])
+def test_geojson_geometries(noisy_tessellation, monkeypatch, shapely_coverage_simplify):
+    monkeypatch.setattr(v_utils, "_GEOJSON_CACHE", OrderedDict())
+    if not shapely_coverage_simplify:
+        monkeypatch.delattr(shapely, "coverage_simplify", raising=False)
+
+    def to_geometries(geojson_geometries):
+        return np.array(
+            [shapely.from_geojson(json.dumps(g)) for g in geojson_geometries]
+        )
+
+    original = to_geometries(v_utils.geojson_geometries(noisy_tessellation, 0, 5))
+    simplified = to_geometries(v_utils.geojson_geometries(noisy_tessellation, 0.0001, 5))
+
+    # fewer vertices
+    assert (
+        shapely.get_num_coordinates(simplified).sum()
+        < shapely.get_num_coordinates(original).sum() / 2
+    )
+
+    # no gaps or overlaps between neighbouring tiles
+    assert shapely.is_valid(simplified).all()
+    union = shapely.union_all(simplified)
+    assert shapely.get_type_id(union) == shapely.GeometryType.POLYGON
+    assert shapely.get_num_interior_rings(union) == 0
+    assert shapely.area(simplified).sum() == pytest.approx(union.area)
+    for i in range(len(simplified)):
+        for j in range(i + 1, len(simplified)):
+            assert shapely.intersection(simplified[i], simplified[j]).area < 1e-12
+
+    # coordinates rounded to the precision
+    coords = shapely.get_coordinates(simplified)
+    assert np.allclose(coords, np.round(coords, 5), rtol=0, atol=1e-9)
+
+    # cached
+    assert v_utils.geojson_geometries(
+        noisy_tessellation, 0.0001, 5
+    ) is v_utils.geojson_geometries(noisy_tessellation, 0.0001, 5)